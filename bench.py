@@ -0,0 +1,327 @@
+"""
+Offline benchmarks for the fetch, parse and render stages of news_page.py.
+
+    python bench.py                                   # synthetic data, scales 1,10,100
+    python bench.py --fixtures fixtures               # fetch stage on recorded responses
+    python bench.py --latency 0.05 --scales 1,10,100,1000 --json bench.json
+
+Nothing here touches the network. Fetches go to news_page's replay server,
+which answers from recorded fixtures (see `news_page.py --record`) and
+synthesizes any response it has no fixture for. Scale N multiplies every
+payload: N x 20 articles per feed, N x 15 games per scoreboard day, N x 25
+quoted symbols, N x 48 forecast periods.
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import news_page
+
+# ─────────────────────────────────────────────
+#  SYNTHETIC PAYLOADS
+# ─────────────────────────────────────────────
+
+WORDS = ("market rally storm city council playoff deal talks vote rate fed chip "
+         "season trade budget school bridge police fire opens closes record").split()
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+
+def synth_rss(n_items: int, seed: str = "") -> bytes:
+    rng = random.Random(seed)
+    items = "".join(
+        f"<item><title>{_sentence(rng, 8)}</title>"
+        f"<link>https://example.com/{seed}/{i}</link>"
+        f"<description>{_sentence(rng, 40)}</description>"
+        f"<pubDate>Sat, 17 Oct 2026 12:00:00 GMT</pubDate></item>"
+        for i in range(n_items)
+    )
+    return (f"<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+            f"<title>{seed}</title><link>https://example.com</link>{items}"
+            f"</channel></rss>").encode("utf-8")
+
+
+def synth_nyt(n_results: int, seed: str = "") -> bytes:
+    rng = random.Random(seed)
+    keywords = ["knicks", "sabres", "nuggets", "bulls", ""]
+    results = [
+        {
+            "title":    f"{_sentence(rng, 8)} {rng.choice(keywords)}".strip(),
+            "abstract": _sentence(rng, 30),
+            "url":      f"https://www.nytimes.com/{seed}/{i}.html",
+            "section":  seed, "published_date": "2026-10-17T08:00:00-04:00",
+            "multimedia": [{"url": f"https://static01.nyt.com/{i}/{k}.jpg",
+                            "caption": _sentence(rng, 20), "height": 600, "width": 900}
+                           for k in range(4)],
+            "des_facet": [rng.choice(WORDS) for _ in range(6)],
+        }
+        for i in range(n_results)
+    ]
+    return json.dumps({"status": "OK", "num_results": n_results, "results": results}).encode()
+
+
+def synth_nba(date_str: str, n_games: int) -> bytes:
+    rng   = random.Random(date_str)
+    teams = [int(t["nba_id"]) for t in news_page.TRACKED_TEAMS.values() if "nba_id" in t]
+    teams += [1610612700 + i for i in range(60) if 1610612700 + i not in teams]
+    gh, ls = [], []
+    for g in range(n_games):
+        gid  = f"00226{g:05d}"
+        home = teams[(2 * g) % len(teams)]
+        away = teams[(2 * g + 1) % len(teams)]
+        gh.append([gid, home, away, rng.choice(["Final", "7:30 pm ET", "Q3 4:12"])])
+        for tid in (home, away):
+            ls.append([gid, tid, f"T{tid % 100:02d}", rng.randint(80, 130)])
+    return json.dumps({"resultSets": [
+        {"name": "GameHeader", "rowSet": gh,
+         "headers": ["GAME_ID", "HOME_TEAM_ID", "VISITOR_TEAM_ID", "GAME_STATUS_TEXT"]},
+        {"name": "LineScore", "rowSet": ls,
+         "headers": ["GAME_ID", "TEAM_ID", "TEAM_ABBREVIATION", "PTS"]},
+    ]}).encode()
+
+
+def synth_nhl(date_str: str, n_games: int) -> bytes:
+    rng   = random.Random(date_str)
+    teams = [int(t["nhl_id"]) for t in news_page.TRACKED_TEAMS.values() if "nhl_id" in t]
+    teams += [i for i in range(1, 60) if i not in teams]
+    games = [
+        {
+            "homeTeam": {"id": teams[(2 * g) % len(teams)], "abbrev": "HOM",
+                         "score": rng.randint(0, 6)},
+            "awayTeam": {"id": teams[(2 * g + 1) % len(teams)], "abbrev": "AWY",
+                         "score": rng.randint(0, 6)},
+            "gameState": rng.choice(["OFF", "LIVE", "FUT"]),
+            "period": 2, "startTimeUTC": f"{date_str}T23:00:00Z",
+        }
+        for g in range(n_games)
+    ]
+    return json.dumps({"games": games}).encode()
+
+
+def synth_quote(symbol: str) -> bytes:
+    rng = random.Random(symbol)
+    return json.dumps({"c": round(rng.uniform(5, 900), 2), "d": 1.5,
+                       "dp": round(rng.uniform(-6, 6), 2)}).encode()
+
+
+def synth_weather(n_periods: int) -> bytes:
+    """Hour-long periods starting this hour, so none of them has ended yet."""
+    start = datetime.now().astimezone().replace(minute=0, second=0, microsecond=0)
+    return json.dumps({"properties": {"periods": [
+        {"number": i + 1, "name": "Today", "temperature": 40 + i % 30,
+         "temperatureUnit": "F", "shortForecast": "Partly Cloudy",
+         "startTime": (start + timedelta(hours=i)).isoformat(),
+         "endTime": (start + timedelta(hours=i + 1)).isoformat(),
+         "detailedForecast": "x" * 200}
+        for i in range(n_periods)
+    ]}}).encode()
+
+
+def synth_points(path: str) -> bytes:
+    lat, lon = (float(v) for v in path.rsplit("/", 1)[-1].split(","))
+    grid_x, grid_y = int(abs(lon) * 10) % 100, int(abs(lat) * 10) % 100
+    base = f"https://api.weather.gov/gridpoints/SYN/{grid_x},{grid_y}"
+    return json.dumps({"properties": {
+        "gridId": "SYN", "gridX": grid_x, "gridY": grid_y,
+        "forecast": f"{base}/forecast", "forecastHourly": f"{base}/forecast/hourly",
+    }}).encode()
+
+
+def synthesize(url: str, scale: int) -> Optional[tuple[int, dict, bytes]]:
+    """Replay-server fallback: a plausible upstream response for url at the given scale."""
+    parts = urlsplit(url)
+    host, path = parts.hostname or "", parts.path
+    json_type = {"Content-Type": "application/json"}
+    if host == "api.nytimes.com":
+        return 200, json_type, synth_nyt(20 * scale, path.rsplit("/", 1)[-1])
+    if host == "finnhub.io":
+        return 200, json_type, synth_quote(parse_qs(parts.query).get("symbol", ["?"])[0])
+    if host == "stats.nba.com":
+        return 200, json_type, synth_nba(parse_qs(parts.query)["gameDate"][0], 15 * scale)
+    if host == "api-web.nhle.com":
+        return 200, json_type, synth_nhl(path.rsplit("/", 1)[-1], 15 * scale)
+    if host == "api.weather.gov" and path.startswith("/points/"):
+        return 200, json_type, synth_points(path)
+    if host == "api.weather.gov":
+        return 200, json_type, synth_weather(48 * scale)
+    if host.endswith(("wivb.com", "bbci.co.uk", "cnbc.com")):
+        return 200, {"Content-Type": "application/rss+xml"}, synth_rss(20 * scale, host)
+    return None
+
+
+# ─────────────────────────────────────────────
+#  TIMING
+# ─────────────────────────────────────────────
+
+RESULTS: list[dict] = []
+_scratch = tempfile.TemporaryDirectory(prefix="bench-")
+
+
+def bench(stage: str, name: str, scale: Any, fn: Callable[[], Any], repeat: int,
+          setup: Optional[Callable[[], None]] = None) -> None:
+    """Times fn `repeat` times (after one warm-up) and records median / min in ms."""
+    if setup:
+        setup()
+    fn()
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    RESULTS.append({"stage": stage, "name": name, "scale": scale,
+                    "median_ms": statistics.median(times), "min_ms": min(times)})
+    print(f"{stage:<7} {name:<28} {str(scale):>6} "
+          f"{statistics.median(times):>10.2f} {min(times):>10.2f}", flush=True)
+
+
+def _cold_cache() -> None:
+    """Fresh, empty on-disk and in-memory caches, so every fetch goes upstream."""
+    news_page.set_cache_dir(tempfile.mkdtemp(prefix="cache-", dir=_scratch.name))
+    news_page.reset_caches()
+
+
+# ─────────────────────────────────────────────
+#  STAGES
+# ─────────────────────────────────────────────
+
+def bench_fetch(scale: Any, repeat: int) -> None:
+    fetchers = {
+        "fetch_weather":          news_page.fetch_weather,
+        "fetch_nyt_section/home": partial(news_page.fetch_nyt_section, "home"),
+        "fetch_nyt_data":         news_page.fetch_nyt_data,
+        "fetch_nyt_sports":       news_page.fetch_nyt_sports,
+        "fetch_buffalo_news":     news_page.fetch_buffalo_news,
+        "fetch_bbc_middle_east":  news_page.fetch_bbc_middle_east,
+        "fetch_cnbc_business":    news_page.fetch_cnbc_business,
+        "fetch_all_sports_data":  news_page.fetch_all_sports_data,
+        "fetch_stock_data":       news_page.fetch_stock_data,
+        "fetch_all":              news_page.fetch_all,
+    }
+    for name, fn in fetchers.items():
+        bench("fetch", name, scale, fn, repeat, setup=_cold_cache)
+    if isinstance(scale, int):
+        symbols = [f"SYN{i:04d}" for i in range(25 * scale)]
+        bench("fetch", f"fetch_quotes x{len(symbols)}", scale,
+              partial(news_page.fetch_quotes, symbols), repeat, setup=_cold_cache)
+
+
+def bench_parse(scale: int, repeat: int) -> None:
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    rss, nyt = synth_rss(20 * scale, "bench"), synth_nyt(20 * scale, "home")
+    nba, nhl = synth_nba(date_str, 15 * scale), synth_nhl(date_str, 15 * scale)
+    parsers = {
+        "parse_rss (streaming)":  partial(news_page.parse_rss, rss),
+        "parse_rss (feedparser)": partial(news_page._parse_rss_feedparser, rss),
+        "nyt top stories":        partial(news_page.parse_nyt, nyt, 3),
+        "nba scoreboardV2":       lambda: news_page.index_nba_scoreboard(json.loads(nba), date_str),
+        "nhl score":              lambda: news_page.index_nhl_scoreboard(json.loads(nhl), date_str),
+    }
+    for name, fn in parsers.items():
+        bench("parse", name, scale, fn, repeat)
+
+
+def bench_render(scale: int, repeat: int) -> None:
+    rng  = random.Random(scale)
+    news = [{"title": _sentence(rng, 8), "abstract": _sentence(rng, 30),
+             "url": f"https://www.nytimes.com/{i}", "link": f"https://example.com/{i}",
+             "summary": _sentence(rng, 40)} for i in range(6 * scale)]
+    games = [{"home": "NYK", "home_pts": 100 + i % 20, "visitor": "BOS",
+              "visitor_pts": 99, "status": rng.choice(["Final", "Live – Q3", "7:30 PM ET"]),
+              "date": "2026-10-17"} for i in range(3 * scale)]
+    quotes = [{"symbol": f"S{i}", "price": rng.uniform(5, 900), "change_abs": 1.0,
+               "change_pct": rng.uniform(-6, 6), "display": f"Sym {i}"} for i in range(10 * scale)]
+    nyt    = {s: news for s in news_page.NYT_SECTIONS}
+    sports = [{"display": t["display"], "games": games} for t in news_page.TRACKED_TEAMS.values()]
+    stocks = {"most_active": quotes, "ai_watchlist": quotes}
+    hourly  = [{"start": f"2026-10-17T{h:02d}:00:00-04:00", "temp": 50 + h % 7}
+               for h in range(news_page.WEATHER_HOURS)]
+    weather = [{"city": f"City {i}", "temp": 51, "unit": "F", "forecast": "Cloudy",
+                "period": "Today", "hourly": hourly} for i in range(scale)]
+
+    renderers = {
+        "render_nyt":            partial(news_page.render_nyt, nyt),
+        "render_buffalo":        partial(news_page.render_buffalo, news),
+        "render_bbc":            partial(news_page.render_bbc, news),
+        "render_cnbc":           partial(news_page.render_cnbc, news),
+        "render_nyt_sports":     partial(news_page.render_nyt_sports, news),
+        "render_weather":        partial(news_page.render_weather, weather),
+        "render_scoreboard":     partial(news_page.render_scoreboard, sports),
+        "render_stocks_sidebar": partial(news_page.render_stocks_sidebar, stocks),
+    }
+    for name, fn in renderers.items():
+        bench("render", name, scale, fn, repeat)
+
+    fragments = dict(
+        news_html=renderers["render_nyt"](), local_html=renderers["render_buffalo"](),
+        bbc_html=renderers["render_bbc"](), weather_html=renderers["render_weather"](),
+        scoreboard_html=renderers["render_scoreboard"](),
+        sports_html=renderers["render_nyt_sports"](), cnbc_html=renderers["render_cnbc"](),
+        stocks_html=renderers["render_stocks_sidebar"](),
+    )
+    bench("render", "build_layout", scale, partial(news_page.build_layout, **fragments), repeat)
+
+
+# ─────────────────────────────────────────────
+#  ENTRY POINT
+# ─────────────────────────────────────────────
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for news_page.py.")
+    parser.add_argument("--fixtures", metavar="DIR",
+                        help="recorded fixtures for the fetch stage (default: synthetic)")
+    parser.add_argument("--latency", type=float, default=0.0, metavar="SECONDS",
+                        help="delay the replay server adds to every response")
+    parser.add_argument("--scales", default="1,10,100",
+                        help="comma-separated payload multipliers (default 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--stages", default="fetch,parse,render",
+                        help="comma-separated subset of fetch,parse,render")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    news_page.configure_logging(logging.WARNING)
+    scales = [int(s) for s in args.scales.split(",")]
+    stages = set(args.stages.split(","))
+    # Replayed upstreams have no quota; don't let the Finnhub limiter dominate timings.
+    news_page._finnhub_limiter = news_page.SlidingWindow([(10 ** 9, 1.0)])
+
+    print(f"{'stage':<7} {'benchmark':<28} {'scale':>6} {'median ms':>10} {'min ms':>10}")
+    if "fetch" in stages:
+        fixture_dir = args.fixtures or tempfile.mkdtemp(prefix="fixtures-", dir=_scratch.name)
+        for scale in ([None] if args.fixtures else scales):
+            server = news_page.enable_replay(
+                fixture_dir, latency=args.latency,
+                fallback=None if scale is None else partial(synthesize, scale=scale),
+            )
+            try:
+                bench_fetch("rec" if scale is None else scale, args.repeat)
+            finally:
+                news_page.disable_replay(server)
+    if "parse" in stages:
+        for scale in scales:
+            bench_parse(scale, args.repeat)
+    if "render" in stages:
+        for scale in scales:
+            bench_render(scale, args.repeat)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(RESULTS, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,166 @@
-import requests
-import feedparser
 import os
+import sys
+import json
+import time
+import hashlib
+import html
 import logging
+import re
+import threading
+from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from typing import Optional
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# requests, feedparser and zoneinfo are imported where first used, so that
+# importing this module (e.g. for the renderers) stays cheap.
+if TYPE_CHECKING:
+    import requests
 
 # --- LOGGING ---
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Root logging setup; done by the entry point, never on import."""
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
+
 # --- CONFIGURATION ---
-NYT_KEY     = os.environ.get('NYT_KEY')
-FINNHUB_KEY = os.environ.get('FINNHUB_KEY')
+class Config:
+    """API credentials, read from the environment when a fetch first needs them."""
+
+    def __init__(self, env: Optional[dict] = None):
+        self._env = os.environ if env is None else env
+
+    def _require(self, name: str) -> str:
+        value = self._env.get(name)
+        if not value:
+            raise EnvironmentError(f"{name} environment variable is not set.")
+        return value
+
+    @property
+    def nyt_key(self) -> str:
+        return self._require('NYT_KEY')
+
+    @property
+    def finnhub_key(self) -> str:
+        return self._require('FINNHUB_KEY')
+
+    def check(self) -> None:
+        """Raises EnvironmentError for the first missing credential."""
+        self.nyt_key
+        self.finnhub_key
 
-if not NYT_KEY:
-    raise EnvironmentError("NYT_KEY environment variable is not set.")
-if not FINNHUB_KEY:
-    raise EnvironmentError("FINNHUB_KEY environment variable is not set.")
+
+CONFIG = Config()
+
+IMPORT_BUDGET_MS   = 150   # `import news_page` must stay under this (see --check-import)
+IMPORT_BUDGET_RUNS = 3     # best of N warm-bytecode imports is compared with the budget
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str):
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+# ── Fetch stage ───────────────────────────────────────────────────────────────
+FETCH_WORKERS   = 16     # max sources in flight at once
+SOURCE_DEADLINE = 10.0   # seconds a single source may run before it is dropped
+RUN_DEADLINE    = 20.0   # seconds the whole fetch stage may run
+
+# ── HTTP client ───────────────────────────────────────────────────────────────
+HTTP_POOL_HOSTS   = 20      # per-host pools kept by the shared session
+HTTP_POOL_SIZE    = 10      # keep-alive connections per host
+HTTP_RETRIES      = 2       # retries on connect errors and HTTP_RETRY_STATUS
+HTTP_BACKOFF      = 0.5     # seconds; urllib3 doubles it on each retry
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+HOST_CONCURRENCY  = {       # max requests in flight per host
+    "finnhub.io":    4,
+    "stats.nba.com": 3,
+}
+HOST_CONCURRENCY_DEFAULT = 6
+
+# Adaptive timeouts and circuit breakers, learned per host and kept across runs.
+HOST_HEALTH_FILE     = "hosts.json"   # under CACHE_DIR
+LATENCY_SAMPLES      = 50             # recent request latencies kept per host
+TIMEOUT_PERCENTILE   = 0.95
+TIMEOUT_FACTOR       = 2.0            # timeout = factor x p95 latency ...
+TIMEOUT_MIN          = 1.5            # ... but at least this, and never above the caller's
+TIMEOUT_MIN_SAMPLES  = 5              # fixed timeouts until a host has this many samples
+BREAKER_FAILURES     = 3              # consecutive failures that open a host's breaker
+BREAKER_COOLDOWN     = 300            # seconds a host is skipped before one probe is let through
+
+# ── Record / replay ───────────────────────────────────────────────────────────
+FIXTURE_DIR    = "fixtures"
+SECRET_PARAMS  = ("api-key", "token")   # never written to fixtures or fixture keys
+RECORD_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Expires", "Cache-Control")
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+METRICS_FILE = "metrics.json"   # per-stage timings, written next to OUTPUT_FILE
+
+# ── Profiling (--profile) ─────────────────────────────────────────────────────
+PROFILE_DIR      = "profiles"   # reports go to PROFILE_DIR/<timestamp>/
+PROFILE_SAMPLE_S = 0.001        # stack sampling interval for the collapsed stacks
+PROFILE_TOP      = 30           # allocation sites listed per stage
+
+# ── Headline dedup ────────────────────────────────────────────────────────────
+# Near-duplicate stories across sources are merged into the copy from the
+# earliest source below, which then links to every other copy.
+DEDUP_SOURCES    = [("nyt", "NYT"), ("nyt_sports", "NYT"), ("buffalo", "WIVB"),
+                    ("bbc", "BBC"), ("cnbc", "CNBC"), ("feeds", None)]  # None: each feed's label
+DEDUP_THRESHOLD  = 0.5    # Jaccard similarity of title+summary word sets
+DEDUP_BANDS      = 16     # LSH bands x rows = MinHash signature length;
+DEDUP_ROWS       = 4      # 16x4 puts the 50%-collision point near 0.5
+DEDUP_BUCKET_CAP = 32     # items kept per LSH bucket; bounds work on boilerplate
+
+# ── Batch (--batch) ───────────────────────────────────────────────────────────
+BATCH_OUTPUT_DIR = "briefs"   # <id>.html for profiles without an explicit output
+BATCH_CHUNKSIZE  = 8          # profiles handed to a render worker at a time
+
+# ── Daemon (--serve) ──────────────────────────────────────────────────────────
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8000
+REFRESH_INTERVAL_DEFAULT = 15 * 60   # sources without a "refresh" in SOURCES
+LIVE_REFRESH_INTERVAL    = 20    # seconds; sports while a tracked game is live
+
+# ── Failover ──────────────────────────────────────────────────────────────────
+CNBC_HEDGE_DELAY = 1.5   # seconds before the next CNBC backup feed starts; 0 = all at once
+
+# ── Local cache ───────────────────────────────────────────────────────────────
+# File and directory names below are relative to CACHE_DIR (see cache_path).
+CACHE_DIR = os.environ.get("BRIEF_CACHE_DIR", ".cache")
+HTTP_CACHE_DIR       = "http"
+HTTP_CACHE_MAX_BYTES = 20 * 1024 * 1024   # bodies + parsed results kept on disk
+
+# ── Output ────────────────────────────────────────────────────────────────────
+OUTPUT_FILE         = "index.html"
+CHANGE_REPORT_FILE  = "changes.json"    # written next to OUTPUT_FILE
+FRAGMENT_CACHE_FILE = "fragments.json"
+DATA_FILE           = "data.json"       # compact per-section data, next to OUTPUT_FILE
+HEADERS_SUFFIX      = ".headers.json"   # <output>.headers.json: HTTP metadata per artifact
+GZIP_LEVEL          = 9
+BROTLI_QUALITY      = 11                # only if the optional brotli package is installed
+# --lazy: a small shell with SHELL_SECTIONS inlined; every other section is a
+# content-hashed file under FRAGMENT_DIR (next to OUTPUT_FILE), fetched when
+# it scrolls into view.
+SHELL_SECTIONS         = ["weather", "scoreboard", "local"]
+FRAGMENT_DIR           = "fragments"
+FRAGMENT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+FRAGMENT_KEEP          = 24 * 3600      # unreferenced fragment files are deleted after this
+
+# ── Snapshots (last known good result per source) ─────────────────────────────
+SNAPSHOT_DIR         = "snapshots"
+SNAPSHOT_VERSION     = 2             # bump when a source's result shape changes
+SNAPSHOT_MAX_AGE     = 3 * 24 * 3600 # seconds after which a snapshot is not served
+STALE_REFRESH_BUDGET = 4.0           # seconds a refresh may take when a snapshot can stand in
+SOURCE_TTL_DEFAULT   = 30 * 60       # seconds a snapshot counts as fresh (no refetch)
 
 # ── Sports ────────────────────────────────────────────────────────────────────
 TRACKED_TEAMS = {
@@ -35,6 +175,27 @@ TEAM_KEYWORDS = [
     "nuggets", "denver nuggets",
     "bulls", "chicago bulls",
 ]
+SCOREBOARD_CACHE_FILE = "scoreboards.json"
+SCOREBOARD_TTL        = 60               # seconds; today / tomorrow
+SCOREBOARD_TTL_LIVE   = 15               # seconds; days with a game in progress
+SCOREBOARD_TTL_FINAL  = 14 * 24 * 3600   # seconds; past days with every game final
+SCOREBOARD_STALE_KEEP = 24 * 3600        # expired days kept as a fallback for failed refreshes
+
+# ── Weather / local news ──────────────────────────────────────────────────────
+WEATHER_CITY      = "Buffalo"
+# {"city", "lat", "lon"} is resolved to a gridpoint through /points (cached
+# in WEATHER_POINTS_FILE); {"city", "gridpoint"} skips the lookup.
+WEATHER_LOCATIONS = [
+    {"city": WEATHER_CITY, "lat": 42.8864, "lon": -78.8784},
+]
+WEATHER_AGENT       = "MorningHeadlines (news_page.py)"   # weather.gov asks for an identifying UA
+WEATHER_POINTS_FILE = "points.json"       # under CACHE_DIR
+WEATHER_POINTS_TTL  = 30 * 24 * 3600      # gridpoints only move when NWS redraws its grid
+WEATHER_PERIODS     = 48                  # forecast periods kept per response
+WEATHER_HOURS       = 8                   # hourly strip length
+WEATHER_WORKERS     = 4
+LOCAL_NEWS_TITLE  = "Buffalo Local News (WIVB)"
+LOCAL_NEWS_FEED   = "https://www.wivb.com/news/local-news/buffalo/feed/"
 
 # ── Stocks ────────────────────────────────────────────────────────────────────
 # AI & tech watchlist (curated)
@@ -59,110 +220,1199 @@ ACTIVE_PROXY = [
     "AMD","META","GOOGL","BAC","F","PLTR","INTC","XOM",
 ]
 
+# Finnhub free tier: 60 calls/min, and no more than 30 in any one second.
+FINNHUB_LIMITS   = [(60, 60.0), (30, 1.0)]   # (calls, seconds) sliding windows
+QUOTE_DEADLINE   = 12.0   # seconds fetch_quotes may take in all; inside the stocks deadline
+QUOTE_TTL        = 60     # seconds a fetched quote is reused
+QUOTE_WORKERS    = 8
+
+# ── History (quotes and scores kept across runs) ──────────────────────────────
+HISTORY_DB      = "history.sqlite"    # under CACHE_DIR
+SPARK_DAYS      = 5                   # sparkline window
+SPARK_POINTS    = 30                  # sparkline resolution (one point per bucket)
+RECENT_RESULTS  = 5                   # past finals shown per team
+
+# ── Source registry ───────────────────────────────────────────────────────────
+# Every upstream the page reads, declared once. Feed-style entries (urls +
+# parser) are fetched, cached and parsed by one engine, fetch_source();
+# composite sources name a custom "fetch" function instead. A key ending in
+# "/*" is a family: "nyt/home" fills "{}" in the family's URLs with "home".
+#   urls      tried in order; with "hedge", each backup starts that many
+#             seconds after the previous one and the first non-empty wins
+#   params    query parameters; "$name" values are read from CONFIG.name
+#   agent     User-Agent header
+#   parser    PARSERS hook for the response body; limit = items it keeps
+#   fields    item keys kept (default: everything the parser returns)
+#   timeout   per-request ceiling (s); deadline = fetch-stage deadline (s)
+#   ttl       seconds a snapshot is fresh; refresh = --serve interval (s)
+#   priority  lower is fetched first
+#   label     short name used in logs and "Also:" links
+#   title     section heading; entries with one and no dedicated renderer
+#             are drawn by render_feeds in the "feeds" section
+#   page      False keeps a source out of the default page (batch-only)
+SOURCES: dict[str, dict] = {
+    "stocks":     {"fetch": "fetch_stock_data", "default": {"most_active": [], "ai_watchlist": []},
+                   "ttl": 60, "refresh": 60, "deadline": 15.0, "priority": 10},
+    "sports":     {"fetch": "fetch_all_sports_data", "default": [],
+                   "ttl": 60, "refresh": 60, "deadline": 12.0, "priority": 10},
+    "weather":    {"fetch": "fetch_weather", "default": [],
+                   "ttl": 30 * 60, "refresh": 30 * 60, "priority": 20},
+    "nyt/*":      {"urls": ["https://api.nytimes.com/svc/topstories/v2/{}.json"],
+                   "params": {"api-key": "$nyt_key"}, "parser": "nyt", "limit": 3,
+                   "timeout": 5, "refresh": 60 * 60, "priority": 30, "label": "NYT"},
+    "nyt_sports": {"fetch": "fetch_nyt_sports", "default": [],
+                   "refresh": 60 * 60, "priority": 30},
+    "quotes/*":   {"ttl": QUOTE_TTL, "deadline": 15.0, "priority": 10, "page": False},
+    "scoreboards/*": {"ttl": SCOREBOARD_TTL, "deadline": 12.0, "priority": 10, "page": False},
+    "nyt_sports_all": {"urls": ["https://api.nytimes.com/svc/topstories/v2/sports.json"],
+                   "params": {"api-key": "$nyt_key"}, "parser": "nyt",
+                   "timeout": 5, "priority": 30, "label": "NYT", "page": False},
+    "buffalo":    {"urls": [LOCAL_NEWS_FEED], "parser": "rss", "limit": 6,
+                   "agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
+                   "fields": ["title", "link"], "timeout": 8,
+                   "ttl": 15 * 60, "refresh": 15 * 60, "priority": 40, "label": "WIVB"},
+    "bbc":        {"urls": ["https://feeds.bbci.co.uk/news/world/middle_east/rss.xml"],
+                   "parser": "rss", "limit": 6, "agent": "Mozilla/5.0", "timeout": 8,
+                   "ttl": 15 * 60, "refresh": 15 * 60, "priority": 40, "label": "BBC"},
+    "cnbc":       {"urls": ["https://www.cnbc.com/id/10000664/device/rss/rss.html",    # Finance / Wall St
+                            "https://www.cnbc.com/id/20409666/device/rss/rss.html",    # Market Insider
+                            "https://www.cnbc.com/id/100727362/device/rss/rss.html"],  # World Top News
+                   "hedge": CNBC_HEDGE_DELAY, "parser": "rss", "limit": 6,
+                   "agent": "Mozilla/5.0", "timeout": 8,
+                   "ttl": 15 * 60, "refresh": 15 * 60, "priority": 40, "label": "CNBC"},
+}
+
 
 # ─────────────────────────────────────────────
-#  DATA FETCHING
+#  METRICS
 # ─────────────────────────────────────────────
 
-def fetch_nyt_section(section: str) -> list[dict]:
-    url = f"https://api.nytimes.com/svc/topstories/v2/{section}.json?api-key={NYT_KEY}"
+def _count_items(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, dict):
+        lists = [v for v in value.values() if isinstance(v, list)]
+        return sum(map(len, lists)) if lists else 1
+    return 1
+
+
+class Metrics:
+    """Timings and counters for every fetch, parse and render stage of one run (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started  = time.time()
+            self.stages:   list[dict]     = []
+            self.http:     list[dict]     = []
+            self.counters: dict[str, int] = {}
+
+    def record(self, stage: str, name: str, seconds: float, **fields) -> None:
+        entry = {"stage": stage, "name": name, "seconds": round(seconds, 4), **fields}
+        with self._lock:
+            self.stages.append(entry)
+
+    @contextmanager
+    def timed(self, stage: str, name: str, **fields):
+        """Times the block; keys set on the yielded dict are added to the record."""
+        extra = dict(fields)
+        t0 = time.perf_counter()
+        try:
+            yield extra
+        except Exception:
+            extra.setdefault("status", "error")
+            raise
+        finally:
+            self.record(stage, name, time.perf_counter() - t0, **extra)
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def record_http(self, **fields) -> None:
+        with self._lock:
+            self.http.append(fields)
+
+    def hosts(self) -> dict[str, dict]:
+        """Per-host totals of the recorded HTTP requests."""
+        hosts: dict[str, dict] = {}
+        with self._lock:
+            requests_ = list(self.http)
+        for h in requests_:
+            agg = hosts.setdefault(h["host"], {"requests": 0, "errors": 0, "bytes": 0,
+                                               "seconds": 0.0, "max_seconds": 0.0,
+                                               "retries": 0, "not_modified": 0})
+            agg["requests"]    += 1
+            agg["errors"]      += h.get("status") in (None, "error") or h["status"] >= 400
+            agg["bytes"]       += h.get("bytes", 0)
+            agg["seconds"]      = round(agg["seconds"] + h["seconds"], 4)
+            agg["max_seconds"]  = max(agg["max_seconds"], h["seconds"])
+            agg["retries"]     += h.get("retries", 0)
+            agg["not_modified"] += h.get("status") == 304
+        return hosts
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages, http, counters = list(self.stages), list(self.http), dict(self.counters)
+        return {
+            "started_at": self.started,
+            "seconds":    round(time.time() - self.started, 3),
+            "stages":     stages,
+            "hosts":      self.hosts(),
+            "http_pools": http_pool_stats(),
+            "counters":   counters,
+            "requests":   http,
+        }
+
+    def summary(self) -> str:
+        """Human-readable tables: slowest stages first, then per-host totals."""
+        data  = self.to_dict()
+        lines = [f"{'stage':<7} {'name':<36} {'ms':>9} {'items':>6} {'bytes':>9}  notes"]
+        for st in sorted(data["stages"], key=lambda st: -st["seconds"]):
+            notes = " ".join(f"{k}={st[k]}" for k in ("cache", "status", "parser") if k in st)
+            lines.append(f"{st['stage']:<7} {st['name'][:36]:<36} {st['seconds'] * 1000:>9.1f} "
+                         f"{st.get('items', '') if st.get('items') is not None else '':>6} "
+                         f"{st.get('bytes', ''):>9}  {notes}")
+        lines.append("")
+        lines.append(f"{'host':<28} {'reqs':>5} {'conns':>5} {'errors':>6} {'retries':>7} "
+                     f"{'304s':>5} {'bytes':>9} {'total s':>8} {'max s':>7}")
+        for host, h in sorted(data["hosts"].items(), key=lambda kv: -kv[1]["seconds"]):
+            conns = data["http_pools"].get(host, {}).get("connections", "")
+            lines.append(f"{host[:28]:<28} {h['requests']:>5} {conns:>5} {h['errors']:>6} "
+                         f"{h['retries']:>7} {h['not_modified']:>5} {h['bytes']:>9} "
+                         f"{h['seconds']:>8.3f} {h['max_seconds']:>7.3f}")
+        if data["counters"]:
+            lines.append("")
+            lines.append("  ".join(f"{k}={v}" for k, v in sorted(data["counters"].items())))
+        return "\n".join(lines)
+
+    def write(self, path: str) -> None:
+        save_json(path, self.to_dict())
+
+
+METRICS = Metrics()
+
+
+# ─────────────────────────────────────────────
+#  HTTP CLIENT
+# ─────────────────────────────────────────────
+
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+
+
+def get_session() -> "requests.Session":
+    """Shared keep-alive session with retry/backoff, created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            adapter = _make_adapter(HTTP_POOL_SIZE)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _make_adapter(pool_size: int):
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUS,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    return HTTPAdapter(pool_connections=HTTP_POOL_HOSTS,
+                       pool_maxsize=pool_size, max_retries=retry)
+
+
+def _host_slot(host: str) -> threading.BoundedSemaphore:
+    with _session_lock:
+        if host not in _host_slots:
+            limit = HOST_CONCURRENCY.get(host, HOST_CONCURRENCY_DEFAULT)
+            _host_slots[host] = threading.BoundedSemaphore(limit)
+        return _host_slots[host]
+
+
+class CircuitOpenError(Exception):
+    """Raised by http_get instead of contacting a host whose breaker is open."""
+
+
+class HostHealth:
+    """
+    Per-host latency samples and circuit breakers (thread-safe, persisted in
+    HOST_HEALTH_FILE). Timeouts adapt to TIMEOUT_FACTOR x the host's p95
+    latency. After BREAKER_FAILURES failures in a row the host is skipped
+    for BREAKER_COOLDOWN seconds, then a single probe decides whether it
+    closes again.
+    """
+
+    def __init__(self):
+        self.hosts: dict[str, dict] = {}
+        self._lock   = threading.Lock()
+        self._loaded = False
+        self._probing: set[str] = set()
+
+    def _host(self, host: str) -> dict:
+        if not self._loaded:
+            self.hosts.update(load_json(cache_path(HOST_HEALTH_FILE), {}))
+            self._loaded = True
+        return self.hosts.setdefault(host, {"samples": [], "failures": 0, "open_until": 0.0})
+
+    def timeout(self, host: str, requested: float) -> float:
+        with self._lock:
+            samples = sorted(self._host(host)["samples"])
+        if len(samples) < TIMEOUT_MIN_SAMPLES:
+            return requested
+        p = samples[min(len(samples) - 1, int(len(samples) * TIMEOUT_PERCENTILE))]
+        return round(min(requested, max(TIMEOUT_MIN, p * TIMEOUT_FACTOR)), 2)
+
+    def admit(self, host: str) -> None:
+        """Raises CircuitOpenError unless a request to host may go out now."""
+        with self._lock:
+            h = self._host(host)
+            if h["failures"] < BREAKER_FAILURES:
+                return
+            if time.time() < h["open_until"] or host in self._probing:
+                METRICS.count("breaker.skipped")
+                raise CircuitOpenError(f"{host} circuit open "
+                                       f"({h['failures']} failures in a row)")
+            self._probing.add(host)   # half-open: this request is the probe
+
+    def record(self, host: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            h = self._host(host)
+            self._probing.discard(host)
+            h["samples"] = (h["samples"] + [round(seconds, 3)])[-LATENCY_SAMPLES:]
+            if ok:
+                h["failures"] = 0
+                return
+            h["failures"] += 1
+            if h["failures"] >= BREAKER_FAILURES:
+                h["open_until"] = time.time() + BREAKER_COOLDOWN
+                logger.warning(f"[HTTP] {host}: {h['failures']} failures in a row, "
+                               f"skipping it for {BREAKER_COOLDOWN}s")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hosts.clear()
+            self._probing.clear()
+            self._loaded = False
+
+    def save(self) -> None:
+        if _replay_base:
+            return   # local fixture-server latencies say nothing about the real hosts
+        with self._lock:
+            if self._loaded:
+                save_json(cache_path(HOST_HEALTH_FILE), self.hosts)
+
+
+HOST_HEALTH = HostHealth()
+
+
+def http_get(
+    url:     str,
+    params:  Optional[dict] = None,
+    headers: Optional[dict] = None,
+    timeout: float = 5,
+) -> "requests.Response":
+    """
+    GET through the shared session, bounded by the host's concurrency limit.
+    `timeout` is a ceiling: hosts with enough history get one adapted to their
+    observed latency, and hosts whose breaker is open raise CircuitOpenError
+    without a request being made. In replay mode the request goes to the
+    local fixture server instead; in record mode the response is also saved
+    as a fixture.
+    """
+    host = urlsplit(url).hostname or ""
+    source_url, source_params = url, params
+    HOST_HEALTH.admit(host)
+    timeout = HOST_HEALTH.timeout(host, timeout)
+    if _replay_base:
+        headers = {**(headers or {}), "X-Replay-URL": canonical_url(url, params)}
+        url, params = f"{_replay_base}/{fixture_key(url, params)}", None
+    elif _record_dir:
+        # Always record full bodies, never 304s.
+        headers = {k: v for k, v in (headers or {}).items()
+                   if k not in ("If-None-Match", "If-Modified-Since")}
+
+    t0 = time.perf_counter()
+    stat = {"host": host, "path": urlsplit(source_url).path, "timeout": timeout}
     try:
-        r = requests.get(url, timeout=5)
-        r.raise_for_status()
-        return r.json().get('results', [])[:3]
+        with _host_slot(host):
+            stat["queued"] = round(time.perf_counter() - t0, 4)
+            r = get_session().get(url, params=params, headers=headers, timeout=timeout)
     except Exception as e:
-        logger.error(f"[NYT/{section}] {e}")
-        return []
+        stat.update(status="error", error=type(e).__name__)
+        # A timed-out request counts as taking the whole timeout, so a host
+        # that slows down pushes its own adaptive timeout back up.
+        HOST_HEALTH.record(host, max(time.perf_counter() - t0 - stat.get("queued", 0.0),
+                                     timeout), ok=False)
+        raise
+    else:
+        retries = getattr(getattr(r.raw, "retries", None), "history", ())
+        # elapsed runs from sending the request (incl. connect/TLS) to parsed headers.
+        headers_s = r.elapsed.total_seconds()
+        total_s   = time.perf_counter() - t0 - stat["queued"]
+        stat.update(status=r.status_code, bytes=len(r.content), retries=len(retries),
+                    headers_s=round(headers_s, 4),
+                    transfer_s=round(max(total_s - headers_s, 0.0), 4))
+        HOST_HEALTH.record(host, total_s, ok=r.status_code < 500)
+    finally:
+        stat["seconds"] = round(time.perf_counter() - t0, 4)
+        METRICS.record_http(**stat)
+    if _record_dir:
+        record_fixture(_record_dir, source_url, source_params, r)
+    return r
+
+
+def http_pool_stats() -> dict[str, dict]:
+    """{host: {requests, connections}} for the shared session's live connection pools."""
+    if _session is None:
+        return {}
+    stats: dict[str, dict] = {}
+    pools = _session.get_adapter("https://").poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        s = stats.setdefault(pool.host, {"requests": 0, "connections": 0})
+        s["requests"]    += pool.num_requests
+        s["connections"] += pool.num_connections
+    return stats
 
 
-def fetch_nyt_data() -> dict[str, list[dict]]:
-    sections = ["home", "nyregion", "opinion", "food", "style"]
-    return {s: fetch_nyt_section(s) for s in sections}
+def log_http_pool_stats() -> None:
+    """Logs requests vs. new connections per host, i.e. how much keep-alive saved."""
+    for host, s in http_pool_stats().items():
+        logger.info(f"[HTTP] {host}: {s['requests']} requests "
+                    f"over {s['connections']} connections")
 
 
-def fetch_nyt_sports() -> list[dict]:
-    url = f"https://api.nytimes.com/svc/topstories/v2/sports.json?api-key={NYT_KEY}"
+# ─────────────────────────────────────────────
+#  RECORD / REPLAY
+# ─────────────────────────────────────────────
+
+_record_dir:  Optional[str] = None
+_replay_base: Optional[str] = None
+
+
+def canonical_url(url: str, params: Optional[dict] = None) -> str:
+    """url with params merged in, query sorted and credentials (SECRET_PARAMS) removed."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in SECRET_PARAMS]
+    query += [(k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+
+
+def fixture_key(url: str, params: Optional[dict] = None) -> str:
+    """Stable, credential-free file stem for a request, e.g. finnhub_io-3f2a9c0d1e4b."""
+    canon = canonical_url(url, params)
+    host  = (urlsplit(canon).hostname or "local").replace(".", "_")
+    return f"{host}-{hashlib.sha1(canon.encode('utf-8')).hexdigest()[:12]}"
+
+
+def write_fixture(directory: str, url: str, status: int,
+                  headers: dict, body: bytes) -> None:
+    """Stores one response as <key>.json (url, status, headers) + <key>.body."""
+    key = fixture_key(url)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, key + ".body"), "wb") as f:
+        f.write(body)
+    save_json(os.path.join(directory, key + ".json"), {
+        "url":     canonical_url(url),
+        "status":  status,
+        "headers": {k: headers[k] for k in RECORD_HEADERS if k in headers},
+    })
+
+
+def record_fixture(directory: str, url: str, params: Optional[dict],
+                   response: "requests.Response") -> None:
+    if response.status_code == 304:
+        return
     try:
-        r = requests.get(url, timeout=5)
-        r.raise_for_status()
-        return [
-            a for a in r.json().get('results', [])
-            if any(kw in (a.get('title','') + ' ' + a.get('abstract','')).lower()
-                   for kw in TEAM_KEYWORDS)
-        ][:5]
-    except Exception as e:
-        logger.error(f"[NYT/sports] {e}")
-        return []
+        write_fixture(directory, canonical_url(url, params), response.status_code,
+                      response.headers, response.content)
+    except OSError as e:
+        logger.warning(f"[Record] could not save {url}: {e}")
 
 
-def fetch_buffalo_news() -> list[dict]:
+def load_fixture(directory: str, key: str) -> Optional[tuple[dict, bytes]]:
+    meta = load_json(os.path.join(directory, key + ".json"), None)
     try:
-        feed = feedparser.parse(
-            "https://www.wivb.com/news/local-news/buffalo/feed/",
-            agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'
-        )
-        return [{"title": e.title, "link": e.link} for e in feed.entries[:6]]
-    except Exception as e:
-        logger.error(f"[WIVB] {e}")
-        return []
+        with open(os.path.join(directory, key + ".body"), "rb") as f:
+            body = f.read()
+    except OSError:
+        return None
+    return (meta, body) if meta else None
 
 
-def fetch_bbc_middle_east() -> list[dict]:
+def start_replay_server(
+    directory:    str,
+    latency:      float = 0.0,
+    host_latency: Optional[dict[str, float]] = None,
+    fallback:     Optional[Callable[[str], Optional[tuple[int, dict, bytes]]]] = None,
+):
+    """
+    Serves recorded fixtures from a local HTTP server on a background thread.
+    Every response is delayed by latency (+ host_latency[host]) seconds.
+    Requests without a fixture go to fallback(url) -> (status, headers, body),
+    if given, otherwise get a 404. Honors If-None-Match against stored ETags.
+    Returns the server; its base URL is http://127.0.0.1:<server_port>.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            key = self.path.lstrip("/").split("?")[0]
+            url = self.headers.get("X-Replay-URL", "")
+            hit = load_fixture(directory, key)
+            made = None if hit or not fallback else fallback(url)
+            if hit:
+                meta, body = hit
+                status, headers = meta["status"], meta.get("headers", {})
+            elif made:
+                status, headers, body = made
+            else:
+                status, headers, body = 404, {}, b"no fixture"
+
+            delay = latency + (host_latency or {}).get(urlsplit(url).hostname or "", 0.0)
+            if delay:
+                time.sleep(delay)
+            if headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+                status, body = 304, b""
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReplayHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="replay", daemon=True).start()
+    return server
+
+
+def enable_recording(directory: str) -> None:
+    """Saves every response http_get receives into directory as a fixture."""
+    global _record_dir
+    _record_dir = directory
+
+
+def enable_replay(directory: str, latency: float = 0.0, **server_kw):
+    """
+    Routes every http_get to a local fixture server for directory and lets
+    fetches run without real credentials. Returns the server.
+    """
+    global _replay_base, CONFIG
+    CONFIG = Config({"NYT_KEY": "replay", "FINNHUB_KEY": "replay", **os.environ})
+    server = start_replay_server(directory, latency=latency, **server_kw)
+    _replay_base = f"http://127.0.0.1:{server.server_port}"
+    # Every upstream shares this one origin now; give it room for all of them.
+    get_session().mount(_replay_base, _make_adapter(HTTP_POOL_SIZE * HTTP_POOL_HOSTS))
+    logger.info(f"[Replay] serving {directory} at {_replay_base} (latency {latency:.3f}s)")
+    return server
+
+
+def disable_replay(server=None) -> None:
+    global _replay_base
+    _replay_base = None
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+
+# ─────────────────────────────────────────────
+#  LOCAL CACHE
+# ─────────────────────────────────────────────
+
+def cache_path(*parts: str) -> str:
+    """Path of a cache file or directory under the current CACHE_DIR."""
+    return os.path.join(CACHE_DIR, *parts)
+
+
+def set_cache_dir(path: str) -> None:
+    """Points every on-disk cache at another directory (e.g. a scratch dir for replay)."""
+    global CACHE_DIR
+    CACHE_DIR = path
+
+
+def reset_caches() -> None:
+    """Forgets the in-memory scoreboard and quote caches (the on-disk ones are kept)."""
+    global _scoreboards_loaded, _points_loaded
+    with _scoreboard_lock:
+        _scoreboards.clear()
+        _scoreboard_locks.clear()
+        _scoreboards_loaded = False
+    with _points_lock:
+        _points.clear()
+        _points_loaded = False
+    with _quote_lock:
+        _quote_cache.clear()
+    HISTORY.close()
+    HOST_HEALTH.reset()
+
+
+def load_json(path: str, default: Any) -> Any:
+    """Reads a cache file; a missing or corrupt file yields default."""
     try:
-        feed = feedparser.parse(
-            "https://feeds.bbci.co.uk/news/world/middle_east/rss.xml",
-            agent='Mozilla/5.0'
-        )
-        return [
-            {"title": e.title, "link": e.link,
-             "summary": e.get('summary', e.get('description', ''))}
-            for e in feed.entries[:6]
-        ]
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, obj: Any) -> None:
+    """Writes a cache file atomically (temp file + rename). Failures are logged, not raised."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"[Cache] could not write {path}: {e}")
+
+
+# ─────────────────────────────────────────────
+#  HTTP CACHE  (conditional GET)
+# ─────────────────────────────────────────────
+
+_http_cache_lock = threading.Lock()
+
+
+def _http_cache_paths(key: str) -> tuple[str, str]:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    base   = cache_path(HTTP_CACHE_DIR, digest)
+    return base + ".json", base + ".body"
+
+
+def _evict_http_cache() -> None:
+    """Drops least-recently-used entries until the cache fits HTTP_CACHE_MAX_BYTES."""
+    try:
+        directory = cache_path(HTTP_CACHE_DIR)
+        files = [os.path.join(directory, n) for n in os.listdir(directory)]
+    except OSError:
+        return
+    entries: dict[str, list] = {}   # stem -> [last used, total bytes, paths]
+    for path in files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        e = entries.setdefault(os.path.splitext(path)[0], [0.0, 0, []])
+        e[0] = max(e[0], st.st_mtime)
+        e[1] += st.st_size
+        e[2].append(path)
+    total = sum(e[1] for e in entries.values())
+    for _, size, paths in sorted(entries.values()):
+        if total <= HTTP_CACHE_MAX_BYTES:
+            break
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+
+
+def _expires_at(headers) -> Optional[float]:
+    """Epoch time a response stays fresh until (Cache-Control max-age, else Expires)."""
+    m = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+    if m:
+        return time.time() + int(m.group(1))
+    if headers.get("Expires"):
+        from email.utils import parsedate_to_datetime
+        try:
+            return parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def cached_get(
+    url:     str,
+    parse:   Callable[[bytes], Any],
+    headers: Optional[dict] = None,
+    timeout: float = 5,
+    expires: bool = False,
+) -> Any:
+    """
+    GET with an on-disk conditional cache. The stored ETag / Last-Modified are
+    sent back; on 304 the previously parsed result is returned without
+    re-downloading or re-parsing. Otherwise the body is parsed and, together
+    with its validators, stored for the next run. If the request fails
+    outright (timeout, connection error, open breaker) the stored result is
+    served stale; without one it raises like http_get. With `expires`, the
+    response's Cache-Control max-age / Expires is honoured too: until then
+    the stored result is returned without any request at all.
+    """
+    meta_path, body_path = _http_cache_paths(f"{url}|{parse.__module__}.{parse.__qualname__}")
+    meta = load_json(meta_path, None)
+    if expires and meta and (meta.get("expires") or 0) > time.time():
+        METRICS.count("http_cache.fresh")
+        return meta["parsed"]
+
+    req_headers = dict(headers or {})
+    if meta:
+        if meta.get("etag"):
+            req_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            req_headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        r = http_get(url, headers=req_headers, timeout=timeout)
     except Exception as e:
-        logger.error(f"[BBC] {e}")
-        return []
+        if not meta:
+            raise
+        # Host down, hanging or breaker open: the last good parse beats nothing.
+        METRICS.count("http_cache.stale")
+        logger.warning(f"[HTTP] {urlsplit(url).hostname}: {e}; serving cached copy")
+        return meta["parsed"]
+    if r.status_code == 304 and meta:
+        METRICS.count("http_cache.hit")
+        logger.debug(f"[HTTP] not modified: {urlsplit(url).path}")
+        if expires:
+            save_json(meta_path, {**meta, "expires": _expires_at(r.headers)})
+        now = time.time()
+        for path in (meta_path, body_path):
+            try:
+                os.utime(path, (now, now))   # mark as recently used
+            except OSError:
+                pass
+        return meta["parsed"]
+    r.raise_for_status()
+    METRICS.count("http_cache.miss")
+
+    parts = urlsplit(url)
+    note_parse(parse, r.content)
+    with METRICS.timed("parse", f"{parts.hostname}{parts.path}",
+                       parser=parse.__name__, bytes=len(r.content)) as m:
+        parsed = parse(r.content)
+        m["items"] = _count_items(parsed)
+    etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    fresh_until = _expires_at(r.headers) if expires else None
+    if etag or last_modified or fresh_until:
+        with _http_cache_lock:
+            try:
+                os.makedirs(cache_path(HTTP_CACHE_DIR), exist_ok=True)
+                with open(body_path, "wb") as f:
+                    f.write(r.content)
+            except OSError as e:
+                logger.warning(f"[Cache] could not write {body_path}: {e}")
+            save_json(meta_path, {"etag": etag, "last_modified": last_modified,
+                                  "expires": fresh_until, "stored": time.time(),
+                                  "parsed": parsed})
+            _evict_http_cache()
+    return parsed
 
 
-def fetch_cnbc_business() -> list[dict]:
+# ─────────────────────────────────────────────
+#  HISTORY  (append-only quotes and scores)
+# ─────────────────────────────────────────────
+
+class HistoryStore:
+    """
+    Append-only SQLite history of every quote and game the page has fetched.
+    Both tables are WITHOUT ROWID, clustered on their primary key, so a
+    symbol's quotes sit contiguously in ts order and a sparkline read is one
+    index range scan no matter how many years or symbols are stored. Errors
+    are logged and swallowed: history never breaks a run.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS quotes (
+            symbol TEXT NOT NULL, ts INTEGER NOT NULL,
+            price REAL NOT NULL, change_pct REAL,
+            PRIMARY KEY (symbol, ts)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS games (
+            league TEXT NOT NULL, game_date TEXT NOT NULL,
+            home_id TEXT NOT NULL, visitor_id TEXT NOT NULL,
+            home TEXT, visitor TEXT, home_pts INTEGER, visitor_pts INTEGER,
+            status TEXT,
+            PRIMARY KEY (league, game_date, home_id, visitor_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS games_home    ON games (league, home_id, game_date);
+        CREATE INDEX IF NOT EXISTS games_visitor ON games (league, visitor_id, game_date);
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._path: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        """The open connection for the current CACHE_DIR (reopened if it moved)."""
+        import sqlite3
+        path = cache_path(HISTORY_DB)
+        if self._conn is None or self._path != path:
+            self.close()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn, self._path = conn, path
+        return self._conn
+
+    def _run(self, what: str, fn: Callable[[Any], Any], default: Any = None) -> Any:
+        import sqlite3
+        with self._lock:
+            try:
+                return fn(self._db())
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"[History] {what}: {e}")
+                return default
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def append_quotes(self, quotes: list[dict]) -> None:
+        rows = [(q["symbol"], int(q.get("time") or time.time()), q["price"], q.get("change_pct"))
+                for q in quotes]
+
+        def write(db):
+            with db:
+                db.execute("BEGIN")
+                db.executemany("INSERT OR IGNORE INTO quotes VALUES (?, ?, ?, ?)", rows)
+        if rows:
+            self._run("append quotes", write)
+
+    def append_games(self, league: str, index: dict[str, list[dict]]) -> None:
+        """Upserts every game of a scoreboard index (scores change until final)."""
+        rows = {
+            (league, g["date"], g["home_id"], g["visitor_id"]):
+                (g["home"], g["visitor"], g["home_pts"], g["visitor_pts"], g["status"])
+            for games in index.values() for g in games
+            if g.get("home_id") and g.get("visitor_id")
+        }
+
+        def write(db):
+            with db:
+                db.execute("BEGIN")
+                db.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               [k + v for k, v in rows.items()])
+        if rows:
+            self._run("append games", write)
+
+    def price_series(self, symbols: list[str], days: float = SPARK_DAYS,
+                     points: int = SPARK_POINTS) -> dict[str, list[float]]:
+        """
+        {symbol: prices} over the last `days`, downsampled in SQL to the last
+        price in each of `points` equal time buckets.
+        """
+        since  = int(time.time() - days * 86400)
+        bucket = max(1, int(days * 86400 / points))
+
+        def read(db):
+            return {
+                sym: [price for _, price in db.execute(
+                    "SELECT MAX(ts), price FROM quotes WHERE symbol = ? AND ts >= ? "
+                    "GROUP BY ts / ? ORDER BY 1", (sym, since, bucket))]
+                for sym in dict.fromkeys(symbols)
+            }
+        return self._run("read quotes", read, {})
+
+    def latest_quotes(self, symbols: list[str]) -> dict[str, dict]:
+        """{symbol: its most recent stored quote, marked "stale"} for symbols that have one."""
+        wanted = list(dict.fromkeys(symbols))
+
+        def read(db):
+            latest = {}
+            for i in range(0, len(wanted), 500):   # under SQLite's bound-parameter limit
+                chunk = wanted[i:i + 500]
+                for sym, ts, price, pct in db.execute(
+                        f"SELECT symbol, MAX(ts), price, change_pct FROM quotes "
+                        f"WHERE symbol IN ({','.join('?' * len(chunk))}) GROUP BY symbol", chunk):
+                    pct = pct or 0.0
+                    prev = price / (1 + pct / 100) if pct > -100 else price
+                    latest[sym] = {"symbol": sym, "price": price, "change_abs": price - prev,
+                                   "change_pct": pct, "time": ts, "stale": True}
+            return latest
+        return self._run("read latest quotes", read, {})
+
+    def recent_games(self, league: str, team_id: str, before: str,
+                     limit: int = RECENT_RESULTS) -> list[dict]:
+        """The team's last `limit` finished games dated before `before`, newest first."""
+        def read(db):
+            rows = db.execute(
+                "SELECT game_date, home_id, home, visitor, home_pts, visitor_pts FROM games "
+                "WHERE league = ? AND (home_id = ? OR visitor_id = ?) AND game_date < ? "
+                "AND status LIKE 'Final%' ORDER BY game_date DESC LIMIT ?",
+                (league, team_id, team_id, before, limit))
+            results = []
+            for date, home_id, home, visitor, home_pts, visitor_pts in rows:
+                at_home = home_id == team_id
+                mine, theirs = (home_pts, visitor_pts) if at_home else (visitor_pts, home_pts)
+                if mine is None or theirs is None:
+                    continue
+                results.append({"date": date, "opponent": visitor if at_home else home,
+                                "home": at_home, "won": mine > theirs,
+                                "score": f"{mine}-{theirs}"})
+            return results
+        return self._run("read games", read, [])
+
+
+HISTORY = HistoryStore()
+
+
+# ─────────────────────────────────────────────
+#  DATA FETCHING
+# ─────────────────────────────────────────────
+
+_RSS_NAMESPACES = {"", "http://purl.org/rss/1.0/", "http://www.w3.org/2005/Atom",
+                   "http://my.netscape.com/rdf/simple/0.9/"}
+_RSS_ITEMS  = {"item", "entry"}                       # RSS 0.9x/1.0/2.0, Atom
+_RSS_FIELDS = {"title": "title", "link": "link",
+               "description": "summary", "summary": "summary"}
+_TAG_RE     = re.compile(r"<[^>]*>")
+_JSON_WS    = re.compile(r"[ \t\n\r]*")
+STREAM_CHUNK = 16 * 1024     # bytes fed to the streaming parsers at a time
+
+
+def _split_tag(tag: str) -> tuple[str, str]:
+    ns, _, name = tag[1:].rpartition("}") if tag.startswith("{") else ("", "", tag)
+    return ns, name
+
+
+def _plain_text(markup: str) -> str:
+    """Feed HTML reduced to escaped text, safe to drop into the page as-is."""
+    return html.escape(html.unescape(_TAG_RE.sub("", markup)).strip(), quote=False)
+
+
+def _html_attr(value: str) -> str:
+    return html.escape(value.strip(), quote=True)
+
+
+def parse_rss(body: bytes, limit: int = 6) -> list[dict]:
     """
-    CNBC public RSS feeds — tries multiple in order and returns first that works.
-    Finance/Wall St → Market Insider → World Top News
+    title / link / summary of the first `limit` feed entries. The XML is fed
+    to a pull parser in chunks and reading stops at the `limit`-th item, so
+    neither the rest of the document nor any element we don't render is
+    ever built. Malformed feeds fall back to feedparser's forgiving parser.
     """
-    feeds = [
-        "https://www.cnbc.com/id/10000664/device/rss/rss.html",   # Finance / Wall St
-        "https://www.cnbc.com/id/20409666/device/rss/rss.html",   # Market Insider
-        "https://www.cnbc.com/id/100727362/device/rss/rss.html",  # World Top News
+    from xml.etree.ElementTree import ParseError, XMLPullParser
+    parser = XMLPullParser(events=("start", "end"))
+    items: list[dict] = []
+    current: Optional[dict] = None
+    view = memoryview(body)
+    try:
+        for offset in range(0, len(view), STREAM_CHUNK):
+            parser.feed(view[offset:offset + STREAM_CHUNK])
+            for event, el in parser.read_events():
+                ns, name = _split_tag(el.tag)
+                if ns not in _RSS_NAMESPACES:
+                    continue
+                if event == "start":
+                    if name in _RSS_ITEMS:
+                        current = {"title": "", "link": "", "summary": ""}
+                    continue
+                if current is None:
+                    continue
+                if name in _RSS_ITEMS:
+                    items.append(current)
+                    current = None
+                    el.clear()
+                    if len(items) >= limit:
+                        return items
+                elif name in _RSS_FIELDS and not current[_RSS_FIELDS[name]]:
+                    if name == "link":
+                        if el.get("rel", "alternate") == "alternate":
+                            current["link"] = _html_attr(el.get("href") or el.text or "")
+                    else:
+                        current[_RSS_FIELDS[name]] = _plain_text(el.text or "")
+        parser.close()
+    except ParseError as e:
+        logger.debug(f"[RSS] falling back to feedparser: {e}")
+        return _parse_rss_feedparser(body, limit)
+    return items
+
+
+def _parse_rss_feedparser(body: bytes, limit: int = 6) -> list[dict]:
+    import feedparser
+    feed = feedparser.parse(body)
+    return [
+        {"title": e.title, "link": e.link,
+         "summary": e.get('summary', e.get('description', ''))}
+        for e in feed.entries[:limit]
     ]
-    for url in feeds:
-        try:
-            feed = feedparser.parse(url, agent='Mozilla/5.0')
-            if feed.entries:
-                return [
-                    {
-                        "title":   e.title,
-                        "link":    e.link,
-                        "summary": e.get('summary', e.get('description', '')),
-                    }
-                    for e in feed.entries[:6]
-                ]
-        except Exception as e:
-            logger.warning(f"[CNBC] {url} failed: {e}")
-    logger.error("[CNBC] All feeds failed.")
-    return []
 
 
-def fetch_weather() -> Optional[dict]:
+def _nyt_article(a: dict) -> dict:
+    """The Top Stories fields the page uses (drops multimedia and facets)."""
+    return {k: a.get(k, '') for k in ("title", "abstract", "url", "section", "published_date")}
+
+
+def _skip_ws(text: str, i: int) -> int:
+    return _JSON_WS.match(text, i).end()
+
+
+def iter_json_array(body: bytes, key: str, limit: Optional[int] = None):
+    """
+    Yields the elements of the top-level `key` array one at a time with
+    raw_decode, skipping sibling values as it goes. Stops after `limit`
+    elements without decoding the rest of the document.
+    """
+    decoder = json.JSONDecoder()
+    text = body.decode("utf-8")
+    i = _skip_ws(text, 0)
+    if text[i:i + 1] != "{":
+        raise ValueError("expected a JSON object")
+    i = _skip_ws(text, i + 1)
+    while text[i:i + 1] != "}":
+        name, i = decoder.raw_decode(text, i)
+        i = _skip_ws(text, i)
+        if text[i:i + 1] != ":":
+            raise ValueError(f"expected ':' at {i}")
+        i = _skip_ws(text, i + 1)
+        if name != key:
+            _, i = decoder.raw_decode(text, i)
+        else:
+            if text[i:i + 1] != "[":
+                raise ValueError(f"{key!r} is not an array")
+            i, n = _skip_ws(text, i + 1), 0
+            while text[i:i + 1] != "]":
+                if limit is not None and n >= limit:
+                    return
+                value, i = decoder.raw_decode(text, i)
+                yield value
+                n += 1
+                i = _skip_ws(text, i)
+                if text[i:i + 1] == ",":
+                    i = _skip_ws(text, i + 1)
+            return
+        i = _skip_ws(text, i)
+        if text[i:i + 1] == ",":
+            i = _skip_ws(text, i + 1)
+
+
+def parse_nyt(body: bytes, limit: Optional[int] = None) -> list[dict]:
+    """The first `limit` (default: all) Top Stories results, page fields only."""
+    return [_nyt_article(a) for a in iter_json_array(body, "results", limit=limit)]
+
+
+PARSERS: dict[str, Callable[..., Any]] = {   # SOURCES "parser" hooks: (body, limit)
+    "rss": parse_rss,
+    "nyt": parse_nyt,
+}
+
+
+def parse_forecast(body: bytes) -> list[dict]:
+    """The first WEATHER_PERIODS periods of a weather.gov forecast (daily or hourly)."""
+    return [
+        {"name": p["name"], "start": p["startTime"], "end": p["endTime"],
+         "temp": p["temperature"], "unit": p["temperatureUnit"],
+         "forecast": p["shortForecast"]}
+        for p in json.loads(body)["properties"]["periods"][:WEATHER_PERIODS]
+    ]
+
+
+def fetch_nyt_section(section: str) -> list[dict]:
+    return fetch_source(source_spec(f"nyt/{section}"))
+
+
+NYT_SECTIONS = ["home", "nyregion", "opinion", "food", "style"]
+
+
+def fetch_nyt_data() -> dict[str, list[dict]]:
+    return {s: fetch_nyt_section(s) for s in NYT_SECTIONS}
+
+
+def fetch_nyt_sports_articles() -> list[dict]:
+    """Every NYT Top Stories sports article, unfiltered."""
+    return fetch_source(source_spec("nyt_sports_all"))
+
+
+def filter_team_articles(articles: list[dict], keywords: list[str],
+                         limit: int = 5) -> list[dict]:
+    return [
+        a for a in articles
+        if any(kw in (a.get('title','') + ' ' + a.get('abstract','')).lower()
+               for kw in keywords)
+    ][:limit]
+
+
+def fetch_nyt_sports() -> list[dict]:
+    return filter_team_articles(fetch_nyt_sports_articles(), TEAM_KEYWORDS)
+
+
+def fetch_buffalo_news(url: str = LOCAL_NEWS_FEED) -> list[dict]:
+    return fetch_source({**source_spec("buffalo"), "urls": [url]})
+
+
+def fetch_bbc_middle_east() -> list[dict]:
+    return fetch_source(source_spec("bbc"))
+
+
+def hedged_first(
+    candidates:  list[tuple[str, Callable[[], Any]]],
+    hedge_delay: float = 1.0,
+    accept:      Callable[[Any], bool] = bool,
+    tag:         str = "Hedge",
+) -> Any:
+    """
+    Hedged failover over (label, callable) candidates in priority order.
+    The primary starts at once and each backup starts hedge_delay seconds
+    after the previous one (immediately if everything in flight has failed;
+    hedge_delay=0 starts them all together). The first accepted result wins,
+    with ties between results that land together going to the higher
+    priority. Candidates not yet started are cancelled; ones already in
+    flight are abandoned and end on their own request timeout.
+    Returns None if no candidate produced an accepted result.
+    """
+    if not candidates:
+        return None
+    pool    = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="hedge")
+    futures: dict[Any, int] = {}
+    pending: set = set()
+
+    def _launch() -> None:
+        i = len(futures)
+        f = pool.submit(candidates[i][1])
+        futures[f] = i
+        pending.add(f)
+
     try:
-        r = requests.get(
-            "https://api.weather.gov/gridpoints/BUF/78,43/forecast", timeout=5
-        )
+        _launch()
+        next_at = time.monotonic() + hedge_delay
+        while pending or len(futures) < len(candidates):
+            while len(futures) < len(candidates) and (
+                    not pending or time.monotonic() >= next_at):
+                _launch()
+                next_at = time.monotonic() + hedge_delay
+            timeout = (max(next_at - time.monotonic(), 0)
+                       if len(futures) < len(candidates) else None)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for f in sorted(done, key=futures.get):
+                pending.discard(f)
+                label = candidates[futures[f]][0]
+                try:
+                    result = f.result()
+                except Exception as e:
+                    logger.warning(f"[{tag}] {label} failed: {e}")
+                    continue
+                if accept(result):
+                    if futures[f]:
+                        logger.info(f"[{tag}] served by backup {label}")
+                    return result
+                logger.warning(f"[{tag}] {label} returned nothing usable")
+        return None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        # Losers' results are worthless; exit_code() need not wait for them.
+        abandon(pending, time.monotonic())
+
+
+def fetch_cnbc_business() -> list[dict]:
+    """CNBC public RSS feeds, hedged across several; the first non-empty one wins."""
+    return fetch_source(source_spec("cnbc"))
+
+
+_points: dict[str, dict] = {}
+_points_lock   = threading.Lock()
+_points_loaded = False
+
+
+def resolve_gridpoint(lat: float, lon: float) -> str:
+    """
+    weather.gov "OFFICE/x,y" gridpoint for a coordinate. Lookups are kept in
+    WEATHER_POINTS_FILE for WEATHER_POINTS_TTL, and an expired one is still
+    used if /points can't be reached.
+    """
+    global _points_loaded
+    key = f"{lat:.4f},{lon:.4f}"   # /points rejects more than four decimals
+    with _points_lock:
+        if not _points_loaded:
+            _points.update(load_json(cache_path(WEATHER_POINTS_FILE), {}))
+            _points_loaded = True
+        entry = _points.get(key)
+    if entry and entry["expires"] > time.time():
+        METRICS.count("points_cache.hit")
+        return entry["gridpoint"]
+    METRICS.count("points_cache.miss")
+    try:
+        r = http_get(f"https://api.weather.gov/points/{key}",
+                     headers={"User-Agent": WEATHER_AGENT}, timeout=5)
         r.raise_for_status()
-        p = r.json()['properties']['periods'][0]
-        return {"temp": p['temperature'], "unit": p['temperatureUnit'],
-                "forecast": p['shortForecast']}
+        p = r.json()["properties"]
+    except Exception:
+        if not entry:
+            raise
+        METRICS.count("points_cache.stale")
+        return entry["gridpoint"]
+    gridpoint = f"{p['gridId']}/{p['gridX']},{p['gridY']}"
+    with _points_lock:
+        _points[key] = {"gridpoint": gridpoint, "expires": time.time() + WEATHER_POINTS_TTL}
+        save_json(cache_path(WEATHER_POINTS_FILE), _points)
+    return gridpoint
+
+
+def _upcoming(periods: list[dict]) -> list[dict]:
+    """Periods that haven't ended yet; a cached forecast may start in the past."""
+    now = datetime.now().astimezone()
+    return [p for p in periods if datetime.fromisoformat(p["end"]) > now]
+
+
+def location_key(location: dict) -> str:
+    return location.get("gridpoint") or f"{location['lat']:.4f},{location['lon']:.4f}"
+
+
+def fetch_location_weather(location: dict) -> Optional[dict]:
+    """
+    Current conditions and the next WEATHER_HOURS hours for one location.
+    Both forecasts are cached until their Expires time, so a run inside that
+    window makes no weather.gov request at all.
+    """
+    city = location.get("city", WEATHER_CITY)
+    headers = {"User-Agent": WEATHER_AGENT}
+    try:
+        gridpoint = location.get("gridpoint") or resolve_gridpoint(location["lat"], location["lon"])
+        url = f"https://api.weather.gov/gridpoints/{gridpoint}/forecast"
+        now = _upcoming(cached_get(url, parse_forecast, headers, timeout=5, expires=True))[0]
     except Exception as e:
-        logger.error(f"[Weather] {e}")
+        logger.error(f"[Weather] {city}: {e}")
         return None
+    try:
+        hourly = _upcoming(cached_get(f"{url}/hourly", parse_forecast, headers,
+                                      timeout=5, expires=True))[:WEATHER_HOURS]
+    except Exception as e:
+        logger.warning(f"[Weather] {city} hourly: {e}")
+        hourly = []
+    return {"city": city, "temp": now["temp"], "unit": now["unit"],
+            "forecast": now["forecast"], "period": now["name"],
+            "hourly": [{"start": h["start"], "temp": h["temp"]} for h in hourly]}
+
+
+def fetch_weather(locations: Optional[list[dict]] = None) -> list[dict]:
+    """Every location's weather (default WEATHER_LOCATIONS), fetched concurrently."""
+    locations = WEATHER_LOCATIONS if locations is None else locations
+    if len(locations) <= 1:
+        results = [fetch_location_weather(loc) for loc in locations]
+    else:
+        with ThreadPoolExecutor(max_workers=min(WEATHER_WORKERS, len(locations)),
+                                thread_name_prefix="weather") as pool:
+            results = list(pool.map(fetch_location_weather, locations))
+    return [w for w in results if w]
 
 
 # ─────────────────────────────────────────────
@@ -172,9 +1422,9 @@ def fetch_weather() -> Optional[dict]:
 def _finnhub_quote(symbol: str) -> Optional[dict]:
     """Single Finnhub /quote call."""
     try:
-        r = requests.get(
+        r = http_get(
             "https://finnhub.io/api/v1/quote",
-            params={"symbol": symbol, "token": FINNHUB_KEY},
+            params={"symbol": symbol, "token": CONFIG.finnhub_key},
             timeout=5,
         )
         r.raise_for_status()
@@ -186,140 +1436,873 @@ def _finnhub_quote(symbol: str) -> Optional[dict]:
             "price":      d['c'],
             "change_abs": d.get('d',  0.0),
             "change_pct": d.get('dp', 0.0),
+            "time":       d.get('t'),
         }
     except Exception as e:
         logger.error(f"[Finnhub] {symbol}: {e}")
         return None
 
 
-def fetch_stock_data() -> dict:
+class SlidingWindow:
+    """
+    Thread-safe sliding-window rate limiter: for every (calls, period) pair,
+    at most `calls` acquisitions in any `period` seconds.
+    """
+
+    def __init__(self, limits: list[tuple[int, float]]):
+        self.limits  = limits
+        self._stamps: deque = deque(maxlen=max(calls for calls, _ in limits))
+        self._lock   = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Takes one slot, sleeping until one is free. False if that would exceed timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # The call `calls` back must have left its window before another may go.
+                wait_for = max([self._stamps[-calls] + period - now
+                                for calls, period in self.limits
+                                if len(self._stamps) >= calls], default=0.0)
+                if wait_for <= 0:
+                    self._stamps.append(now)
+                    return True
+            if deadline is not None and now + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+
+_finnhub_limiter = SlidingWindow(FINNHUB_LIMITS)
+_quote_cache: dict[str, tuple[float, dict]] = {}
+_quote_lock = threading.Lock()
+
+
+def _limited_quote(symbol: str, deadline: float) -> Optional[dict]:
+    if not _finnhub_limiter.acquire(timeout=deadline - time.monotonic()):
+        METRICS.count("finnhub.skipped")
+        return None
+    return _finnhub_quote(symbol)
+
+
+def fetch_quotes(symbols: list[str], deadline: float = QUOTE_DEADLINE) -> dict[str, dict]:
+    """
+    Quotes for every distinct symbol, fetched concurrently under the Finnhub
+    rate limit. Quotes younger than QUOTE_TTL are served from memory.
+    The whole fetch gets `deadline` seconds. Symbols that can't get a rate
+    limit slot or an answer by then fall back to their last quote in
+    HISTORY (marked "stale"); ones with no quote at all are left out. With
+    more symbols than one run's quota, those never stored or stored longest
+    ago go first, then a rotating start, so every symbol is refreshed over
+    successive runs.
+    """
+    wanted = list(dict.fromkeys(symbols))
+    now    = time.monotonic()
+    quotes: dict[str, dict] = {}
+    with _quote_lock:
+        for sym in wanted:
+            hit = _quote_cache.get(sym)
+            if hit and now - hit[0] < QUOTE_TTL:
+                quotes[sym] = hit[1]
+    missing = [sym for sym in wanted if sym not in quotes]
+    METRICS.count("quote_cache.hit", len(wanted) - len(missing))
+    METRICS.count("quote_cache.miss", len(missing))
+
+    if missing:
+        stored = HISTORY.latest_quotes(missing)
+        turn = int(time.time() // 60) % len(missing)
+        missing = missing[turn:] + missing[:turn]
+        missing.sort(key=lambda sym: stored[sym]["time"] if sym in stored else 0)
+        end = time.monotonic() + deadline
+        pool = ThreadPoolExecutor(max_workers=QUOTE_WORKERS, thread_name_prefix="quotes")
+        futures = {pool.submit(_limited_quote, sym, end): sym for sym in missing}
+        done, late = wait(futures, timeout=deadline)
+        pool.shutdown(wait=False, cancel_futures=True)
+        abandon(late, end)
+        fetched = {futures[f]: f.result() for f in done}
+        with _quote_lock:
+            for sym, q in fetched.items():
+                if q:
+                    _quote_cache[sym] = (time.monotonic(), q)
+                    quotes[sym] = q
+        HISTORY.append_quotes([q for q in fetched.values() if q])
+        skipped = [sym for sym in missing if not fetched.get(sym)]
+        quotes.update({sym: stored[sym] for sym in skipped if sym in stored})
+        if skipped:
+            METRICS.count("finnhub.stale", sum(sym in stored for sym in skipped))
+            logger.warning(f"[Finnhub] {len(skipped)} symbols not fetched in "
+                           f"{deadline:.0f}s; {sum(sym in stored for sym in skipped)} "
+                           f"served from history")
+
+    logger.info(f"[Finnhub] {len(quotes)}/{len(wanted)} quotes "
+                f"({len(wanted) - len(missing)} cached)")
+    return quotes
+
+
+def build_stock_data(
+    quotes:    dict[str, dict],
+    active:    list[str] = ACTIVE_PROXY,
+    watchlist: list[tuple[str, str]] = AI_WATCHLIST,
+) -> dict:
+    """
+    Returns:
+      most_active  — top 10 from active, sorted by |% change| (biggest movers)
+      ai_watchlist — watchlist quotes with display names
+    Every quote also gets "spark": its recent prices from HISTORY.
+    """
+    # Most active / top movers
+    proxy_quotes = [quotes[sym] for sym in active if sym in quotes]
+    proxy_quotes.sort(key=lambda x: abs(x['change_pct']), reverse=True)
+    most_active = proxy_quotes[:10]
+
+    # AI watchlist
+    ai_stocks = [
+        {**quotes[symbol], "display": display}
+        for symbol, display in watchlist if symbol in quotes
+    ]
+
+    # Sparklines from the local history (no extra API calls)
+    series = HISTORY.price_series([q["symbol"] for q in most_active + ai_stocks])
+    most_active = [{**q, "spark": series.get(q["symbol"], [])} for q in most_active]
+    ai_stocks   = [{**q, "spark": series.get(q["symbol"], [])} for q in ai_stocks]
+
+    return {"most_active": most_active, "ai_watchlist": ai_stocks}
+
+
+def fetch_stock_data() -> dict:
+    """build_stock_data() over freshly fetched ACTIVE_PROXY + AI_WATCHLIST quotes."""
+    logger.info("Fetching stock quotes...")
+    quotes = fetch_quotes(ACTIVE_PROXY + [symbol for symbol, _ in AI_WATCHLIST])
+    return build_stock_data(quotes)
+
+
+# ─────────────────────────────────────────────
+#  SPORTS  (NBA / NHL public APIs)
+# ─────────────────────────────────────────────
+
+_scoreboards: dict[str, dict] = {}
+_scoreboards_loaded = False
+_scoreboard_lock  = threading.Lock()
+_scoreboard_locks: dict[str, threading.Lock] = {}
+
+
+def index_nba_scoreboard(data: dict, date_str: str) -> dict[str, list[dict]]:
+    """
+    {team_id: [game, ...]} from a scoreboardV2 payload in one pass over
+    each result set: LineScore is first indexed by GAME_ID, then every
+    GameHeader row is joined against that index in O(1). Both teams'
+    lists share the same game dict.
+    """
+    result_sets = {r['name']: r for r in data['resultSets']}
+    gh, ls = result_sets['GameHeader'], result_sets['LineScore']
+    ghi = {h: i for i, h in enumerate(gh['headers'])}
+    lsi = {h: i for i, h in enumerate(ls['headers'])}
+
+    l_gid, l_tid = lsi['GAME_ID'], lsi['TEAM_ID']
+    l_abbr, l_pts = lsi['TEAM_ABBREVIATION'], lsi['PTS']
+    line_scores: dict[str, dict[str, tuple]] = {}   # GAME_ID -> TEAM_ID -> (abbr, pts)
+    for lr in ls['rowSet']:
+        line_scores.setdefault(lr[l_gid], {})[str(lr[l_tid])] = (lr[l_abbr], lr[l_pts])
+
+    g_gid, g_hid = ghi['GAME_ID'], ghi['HOME_TEAM_ID']
+    g_vid, g_status = ghi['VISITOR_TEAM_ID'], ghi['GAME_STATUS_TEXT']
+    by_team: dict[str, list[dict]] = {}
+    for row in gh['rowSet']:
+        gid    = row[g_gid]
+        hid    = str(row[g_hid])
+        vid    = str(row[g_vid])
+        scores = line_scores.get(gid, {})
+        home_abbr, home_pts = scores.get(hid, ("?", None))
+        vis_abbr,  vis_pts  = scores.get(vid, ("?", None))
+        game = {
+            "home": home_abbr, "home_pts": home_pts,
+            "visitor": vis_abbr, "visitor_pts": vis_pts,
+            "status": row[g_status].strip(), "date": date_str,
+            "home_id": hid, "visitor_id": vid,
+        }
+        by_team.setdefault(hid, []).append(game)
+        by_team.setdefault(vid, []).append(game)
+    return by_team
+
+
+def _nba_scoreboard(date_str: str) -> dict[str, list[dict]]:
+    """Downloads one NBA scoreboardV2 day and indexes its games by team id."""
+    url = (f"https://stats.nba.com/stats/scoreboardV2"
+           f"?DayOffset=0&LeagueID=00&gameDate={date_str}")
+    headers = {"User-Agent": "Mozilla/5.0",
+               "Referer": "https://www.nba.com/", "Accept": "application/json"}
+    res = http_get(url, headers=headers, timeout=8)
+    res.raise_for_status()
+    note_parse(lambda body: index_nba_scoreboard(json.loads(body), date_str), res.content)
+    with METRICS.timed("parse", f"nba/{date_str}", parser="index_nba_scoreboard",
+                       bytes=len(res.content)) as m:
+        index = index_nba_scoreboard(res.json(), date_str)
+        m["items"] = len(index) // 2
+    return index
+
+
+def index_nhl_scoreboard(data: dict, date_str: str) -> dict[str, list[dict]]:
+    """{team_id: [game, ...]} from an NHL /v1/score payload."""
+    index: dict[str, list[dict]] = {}
+    for g in data.get("games", []):
+        hid = str(g.get("homeTeam", {}).get("id", ""))
+        aid = str(g.get("awayTeam", {}).get("id", ""))
+        state = g.get("gameState", "")
+        if state in ("OFF", "FINAL"):
+            status = "Final"
+        elif state in ("LIVE", "CRIT"):
+            status = f"Live – P{g.get('period','')}"
+        else:
+            try:
+                dt = datetime.strptime(
+                    g.get("startTimeUTC",""), "%Y-%m-%dT%H:%M:%SZ"
+                ).replace(tzinfo=_zone("UTC"))
+                status = dt.astimezone(
+                    _zone("America/New_York")
+                ).strftime("%-I:%M %p ET")
+            except Exception:
+                status = "Scheduled"
+        home = g.get("homeTeam", {})
+        away = g.get("awayTeam", {})
+        game = {
+            "home": home.get("abbrev","?"), "home_pts": home.get("score"),
+            "visitor": away.get("abbrev","?"), "visitor_pts": away.get("score"),
+            "status": status, "date": date_str,
+            "home_id": hid, "visitor_id": aid,
+        }
+        index.setdefault(hid, []).append(game)
+        index.setdefault(aid, []).append(game)
+    return index
+
+
+def _nhl_scoreboard(date_str: str) -> dict[str, list[dict]]:
+    """Downloads one NHL /v1/score day and indexes its games by team id."""
+    res = http_get(
+        f"https://api-web.nhle.com/v1/score/{date_str}", timeout=8
+    )
+    res.raise_for_status()
+    note_parse(lambda body: index_nhl_scoreboard(json.loads(body), date_str), res.content)
+    with METRICS.timed("parse", f"nhl/{date_str}", parser="index_nhl_scoreboard",
+                       bytes=len(res.content)) as m:
+        index = index_nhl_scoreboard(res.json(), date_str)
+        m["items"] = len(index) // 2
+    return index
+
+
+_SCOREBOARD_FETCHERS = {"nba": _nba_scoreboard, "nhl": _nhl_scoreboard}
+
+
+def is_live(game: dict) -> bool:
+    """True while a game is in progress (NHL "Live – P2", NBA "Q3 5:12" / "3rd Qtr" / "Halftime")."""
+    status = game.get("status", "").lower()
+    return ("live" in status or "qtr" in status or "half" in status
+            or (status[:1] == "q" and status[1:2].isdigit()) or status.startswith("ot"))
+
+
+def _scoreboard_ttl(date_str: str, index: dict[str, list[dict]]) -> float:
+    """Finished past days never change again; live days are re-polled fastest."""
+    games = [g for day_games in index.values() for g in day_games]
+    if any(is_live(g) for g in games):
+        return SCOREBOARD_TTL_LIVE
+    today = datetime.now(_zone("America/New_York")).strftime("%Y-%m-%d")
+    if date_str < today and all(g["status"].lower().startswith("final") for g in games):
+        return SCOREBOARD_TTL_FINAL
+    return SCOREBOARD_TTL
+
+
+def _load_scoreboards() -> None:
+    global _scoreboards_loaded
+    if _scoreboards_loaded:
+        return
+    for key, entry in load_json(cache_path(SCOREBOARD_CACHE_FILE), {}).items():
+        if entry.get("ok"):
+            _scoreboards[key] = entry   # expired ones stay as a fallback
+    _scoreboards_loaded = True
+
+
+def scoreboard(league: str, date_str: str) -> dict[str, list[dict]]:
+    """
+    {team_id: [game, ...]} for one league/day.
+    Each league/day is downloaded at most once per TTL no matter how many
+    tracked teams ask for it; finished days are kept on disk between runs.
+    """
+    key = f"{league}/{date_str}"
+    with _scoreboard_lock:
+        _load_scoreboards()
+        key_lock = _scoreboard_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        entry = _scoreboards.get(key)
+        if entry and entry["expires"] > time.time():
+            METRICS.count("scoreboard_cache.hit")
+            return entry["index"]
+        METRICS.count("scoreboard_cache.miss")
+        try:
+            index = _SCOREBOARD_FETCHERS[league](date_str)
+            ttl   = _scoreboard_ttl(date_str, index)
+            failed = False
+        except Exception as e:
+            logger.error(f"[{league.upper()}] scoreboard {date_str}: {e}")
+            if entry and entry["ok"]:
+                METRICS.count("scoreboard_cache.stale")
+                return entry["index"]
+            index, ttl, failed = {}, SCOREBOARD_TTL, True
+        _scoreboards[key] = {"expires": time.time() + ttl, "index": index,
+                             "ok": not failed}
+
+    if not failed:
+        HISTORY.append_games(league, index)
+        with _scoreboard_lock:
+            now = time.time()
+            save_json(cache_path(SCOREBOARD_CACHE_FILE), {
+                k: e for k, e in _scoreboards.items()
+                if e["ok"] and e["expires"] > now - SCOREBOARD_STALE_KEEP
+            })
+    return index
+
+
+def nba_team_games(team_id: str, date_str: str) -> list[dict]:
+    return scoreboard("nba", date_str).get(team_id, [])
+
+
+def nhl_team_games(team_id: str, date_str: str) -> list[dict]:
+    return scoreboard("nhl", date_str).get(team_id, [])
+
+
+def sports_dates() -> list[str]:
+    """Yesterday, today and tomorrow (US Eastern) as YYYY-MM-DD."""
+    now = datetime.now(_zone("America/New_York"))
+    return [(now + timedelta(days=d)).strftime("%Y-%m-%d") for d in (-1, 0, 1)]
+
+
+def fetch_scoreboards(leagues: list[str], dates: list[str]) -> dict[str, dict[str, list[dict]]]:
+    """
+    {"<league>/<date>": team index} for every league/day, fetched side by
+    side. {} if every one of them failed, so the caller's snapshot stands in
+    instead of a board with no games.
+    """
+    keys = [(lg, d) for lg in sorted(set(leagues)) for d in dates]
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS,
+                            thread_name_prefix="sports") as pool:
+        indexes = list(pool.map(lambda ld: scoreboard(*ld), keys))
+    with _scoreboard_lock:
+        failed = sum(not _scoreboards.get(f"{lg}/{d}", {}).get("ok") for lg, d in keys)
+    if keys and failed == len(keys):
+        logger.error("[Sports] every scoreboard failed")
+        return {}
+    return {f"{lg}/{d}": index for (lg, d), index in zip(keys, indexes)}
+
+
+def team_games(
+    scoreboards: dict[str, dict[str, list[dict]]],
+    teams:       dict[str, dict],
+    dates:       list[str],
+) -> list[dict]:
+    """
+    Per-team scoreboard entries for the renderer, answered from fetched
+    indexes, plus the team's last finished games before the window from HISTORY.
+    """
+    results = []
+    for info in teams.values():
+        team_id = info[f"{info['league']}_id"]
+        entry = {"display": info["display"], "games": [],
+                 "recent": HISTORY.recent_games(info["league"], team_id, dates[0])}
+        for d in dates:
+            entry["games"].extend(
+                scoreboards.get(f"{info['league']}/{d}", {}).get(team_id, [])
+            )
+        results.append(entry)
+    return results
+
+
+def fetch_all_sports_data(teams: Optional[dict[str, dict]] = None) -> list[dict]:
+    # One request per league/day, shared by every tracked team in that league.
+    teams = TRACKED_TEAMS if teams is None else teams
+    dates = sports_dates()
+    boards = fetch_scoreboards([info["league"] for info in teams.values()], dates)
+    if not boards:
+        return []
+    return team_games(boards, teams, dates)
+
+
+# ─────────────────────────────────────────────
+#  SOURCE ENGINE  (drives every SOURCES entry)
+# ─────────────────────────────────────────────
+
+FETCHERS: dict[str, Callable[[], Any]] = {    # SOURCES "fetch" hooks
+    "fetch_stock_data":      fetch_stock_data,
+    "fetch_all_sports_data": fetch_all_sports_data,
+    "fetch_weather":         fetch_weather,
+    "fetch_nyt_sports":      fetch_nyt_sports,
+}
+
+
+def source_spec(name: str) -> dict:
+    """The SOURCES entry for name, with "/*" families filled in (nyt/home, ...)."""
+    if name in SOURCES:
+        return SOURCES[name]
+    family, _, arg = name.partition("/")
+    spec = SOURCES.get(f"{family}/*")
+    if spec is None or not arg:
+        raise KeyError(f"unknown source {name!r}")
+    if "urls" not in spec:
+        return spec
+    return {**spec, "urls": [u.format(arg) for u in spec["urls"]]}
+
+
+def source_setting(name: str, key: str, default: Any = None) -> Any:
+    """One registry setting of a source; default for names not in SOURCES (batch jobs)."""
+    try:
+        return source_spec(name).get(key, default)
+    except KeyError:
+        return default
+
+
+def source_ttl(name: str) -> float:
+    return source_setting(name, "ttl", SOURCE_TTL_DEFAULT)
+
+
+def source_refresh(name: str) -> float:
+    return source_setting(name, "refresh", REFRESH_INTERVAL_DEFAULT)
+
+
+def source_deadlines(names: list[str]) -> dict[str, float]:
+    return {n: source_setting(n, "deadline") for n in names
+            if source_setting(n, "deadline") is not None}
+
+
+def page_sources() -> list[str]:
+    """Names of every source on the default page, highest priority first."""
+    names = []
+    for key, spec in SOURCES.items():
+        if spec.get("page", True):
+            names += [f"nyt/{s}" for s in NYT_SECTIONS] if key == "nyt/*" else [key]
+    return sorted(names, key=lambda n: source_spec(n).get("priority", 100))
+
+
+@lru_cache(maxsize=None)
+def _bound_parser(name: str, limit: Optional[int]) -> Callable[[bytes], Any]:
+    """A PARSERS hook with its limit bound, named per limit so HTTP cache keys differ."""
+    hook = PARSERS[name]
+
+    def parse(body: bytes) -> Any:
+        return hook(body, limit)
+    parse.__module__   = hook.__module__
+    parse.__name__     = hook.__name__
+    parse.__qualname__ = f"{hook.__qualname__}[{limit}]"
+    return parse
+
+
+def _fetch_source_url(spec: dict, url: str) -> Any:
+    params = {k: getattr(CONFIG, v[1:]) if isinstance(v, str) and v.startswith("$") else v
+              for k, v in spec.get("params", {}).items()}
+    if params:
+        url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+    headers = {"User-Agent": spec["agent"]} if spec.get("agent") else None
+    items = cached_get(url, _bound_parser(spec["parser"], spec.get("limit")),
+                       headers=headers, timeout=spec.get("timeout", 5))
+    if spec.get("fields") and isinstance(items, list):
+        items = [{k: item.get(k, "") for k in spec["fields"]} for item in items]
+    return items
+
+
+def fetch_source(spec: dict) -> Any:
+    """
+    Fetches one SOURCES entry. Composite sources run their "fetch" hook;
+    feed sources GET each URL through the conditional HTTP cache and parse
+    it with their "parser" hook, trying URLs in order (or hedged, with
+    "hedge") until one returns items. Errors are logged and the entry's
+    default is returned, like every hand-written fetcher before it.
+    """
+    if "fetch" in spec:
+        return FETCHERS[spec["fetch"]]()
+    label   = spec.get("label") or urlsplit(spec["urls"][0]).hostname
+    default = spec.get("default", [])
+    try:
+        if spec.get("hedge") is not None and len(spec["urls"]) > 1:
+            items = hedged_first(
+                [(url, partial(_fetch_source_url, spec, url)) for url in spec["urls"]],
+                hedge_delay=spec["hedge"], tag=label,
+            )
+        else:
+            items = None
+            for url in spec["urls"]:
+                try:
+                    items = _fetch_source_url(spec, url)
+                except Exception as e:
+                    if url == spec["urls"][-1]:
+                        raise
+                    logger.warning(f"[{label}] {url} failed: {e}")
+                    continue
+                if items:
+                    break
+    except Exception as e:
+        logger.error(f"[{label}] {e}")
+        return default
+    if not items:
+        if len(spec["urls"]) > 1:
+            logger.error(f"[{label}] All feeds failed.")
+        return default
+    return items
+
+
+# ─────────────────────────────────────────────
+#  FETCH ORCHESTRATION
+# ─────────────────────────────────────────────
+
+# Futures of dropped work that are still running, with the monotonic time
+# until which the process may wait for them (see exit_code below). Entries
+# remove themselves on completion, so a long-lived --serve process keeps none.
+_stragglers: dict = {}
+_stragglers_lock = threading.Lock()
+
+
+def _forget_straggler(future) -> None:
+    with _stragglers_lock:
+        _stragglers.pop(future, None)
+
+
+def abandon(futures, until: float) -> None:
+    """Records futures of dropped work that exit_code() may wait for until `until`."""
+    for f in futures:
+        with _stragglers_lock:
+            _stragglers[f] = until
+        f.add_done_callback(_forget_straggler)   # runs at once if f is already done
+
+
+def stragglers_running() -> int:
+    """Number of dropped fetches that haven't finished yet."""
+    with _stragglers_lock:
+        return sum(not f.done() for f in _stragglers)
+
+
+def _deliver_late(name: str, on_late: Callable[[str, Any], None], future) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        on_late(name, future.result())
+    except Exception as e:
+        logger.error(f"[Fetch] {name}: handling late result failed: {e}")
+
+
+def run_fetch_stage(
+    jobs:            dict[str, tuple[Callable[[], Any], Any]],
+    source_deadline: float = SOURCE_DEADLINE,
+    run_deadline:    float = RUN_DEADLINE,
+    deadlines:       Optional[dict[str, float]] = None,
+    on_late:         Optional[Callable[[str, Any], None]] = None,
+) -> dict[str, Any]:
+    """
+    Runs every job concurrently and returns {name: result}.
+    jobs maps a source name to (callable, default). A source that raises,
+    overruns its own deadline or is still running at the run deadline gets
+    its default, so the page renders with whatever came back in time.
+    A dropped source that later finishes is passed to on_late(name, result).
+    """
+    deadlines = deadlines or {}
+    results   = {name: default for name, (_, default) in jobs.items()}
+    if not jobs:
+        return results
+
+    start   = time.monotonic()
+    run_end = start + run_deadline
+    started: dict[str, float] = {}
+    dropped: set[str] = set()
+
+    def _timed(name: str, fn: Callable[[], Any]) -> Any:
+        started[name] = time.monotonic()
+        with METRICS.timed("fetch", name) as m:
+            result = fn()
+            m["items"]  = _count_items(result)
+            m["status"] = "late" if name in dropped else "ok"
+        return result
+
+    def _due(name: str) -> float:
+        if name not in started:          # still queued behind other sources
+            return run_end
+        return min(started[name] + deadlines.get(name, source_deadline), run_end)
+
+    pool = ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(jobs)),
+                              thread_name_prefix="fetch")
+    futures = {pool.submit(_timed, name, fn): name for name, (fn, _) in jobs.items()}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            for f in [f for f in pending if now >= _due(futures[f])]:
+                pending.discard(f)
+                if not f.cancel():       # already running
+                    abandon([f], run_end)
+                    if on_late:
+                        f.add_done_callback(partial(_deliver_late, futures[f], on_late))
+                dropped.add(futures[f])
+                METRICS.count("fetch.deadline_missed")
+                logger.warning(f"[Fetch] {futures[f]} missed its deadline, using fallback")
+            if not pending:
+                break
+            timeout = min(_due(futures[f]) for f in pending) - now
+            done, pending = wait(pending, timeout=max(timeout, 0),
+                                 return_when=FIRST_COMPLETED)
+            for f in done:
+                try:
+                    results[futures[f]] = f.result()
+                except Exception as e:
+                    logger.error(f"[Fetch] {futures[f]} failed: {e}")
+    finally:
+        # Don't block on stragglers; their own request timeouts end them, or
+        # exit_code() stops waiting for them when the run is over.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"[Fetch] {len(jobs)} sources in {time.monotonic() - start:.1f}s")
+    return results
+
+
+def _snapshot_path(name: str) -> str:
+    return cache_path(SNAPSHOT_DIR, name.replace("/", "__") + ".json")
+
+
+def load_snapshot(name: str) -> Optional[dict]:
+    """Last good snapshot of a source, or None if missing, too old or from another version."""
+    snap = load_json(_snapshot_path(name), None)
+    if (not isinstance(snap, dict) or snap.get("version") != SNAPSHOT_VERSION
+            or time.time() - snap.get("saved_at", 0) > SNAPSHOT_MAX_AGE):
+        return None
+    return snap
+
+
+def save_snapshot(name: str, data: Any, previous: Optional[dict] = None) -> None:
+    if _replay_base:
+        return   # fixture data must never pass for a fresh live result
+    save_json(_snapshot_path(name), {
+        "version":  SNAPSHOT_VERSION,
+        "revision": (previous or {}).get("revision", 0) + 1,
+        "saved_at": time.time(),
+        "data":     data,
+    })
+
+
+def _has_data(value: Any) -> bool:
+    """False for the empty results fetchers return on failure ([], None, {k: []})."""
+    if isinstance(value, dict) and value and all(isinstance(v, list) for v in value.values()):
+        return any(value.values())
+    return bool(value)
+
+
+def fetch_with_snapshots(
+    jobs:       dict[str, tuple[Callable[[], Any], Any]],
+    deadlines:  Optional[dict[str, float]] = None,
+    use_fresh:  bool = True,
+) -> dict[str, Any]:
     """
-    Returns:
-      most_active  — top 10 from ACTIVE_PROXY, sorted by |% change| (biggest movers)
-      ai_watchlist — AI_WATCHLIST quotes with display names
+    run_fetch_stage with stale-while-revalidate on top.
+    A source whose snapshot is younger than its TTL is served from it and not
+    fetched (unless use_fresh is False). A source with an older snapshot is
+    refreshed, but only gets STALE_REFRESH_BUDGET seconds; if the refresh is
+    late, fails or comes back empty the snapshot is served instead. Good
+    results become the new snapshot, including ones that arrive after their
+    deadline, so a source slower than the budget is current on the next run.
     """
-    logger.info("Fetching stock quotes...")
+    deadlines = dict(deadlines or {})
+    now       = time.time()
+    snaps     = {name: load_snapshot(name) for name in jobs}
+    results: dict[str, Any] = {}
+    to_fetch: dict[str, tuple[Callable[[], Any], Any]] = {}
+    for name, (fn, default) in jobs.items():
+        snap = snaps[name]
+        if (use_fresh and snap
+                and now - snap["saved_at"] < source_ttl(name)):
+            results[name] = snap["data"]
+            METRICS.record("fetch", name, 0.0, cache="snapshot",
+                           items=_count_items(snap["data"]))
+            continue
+        if snap:
+            deadlines[name] = min(deadlines.get(name, SOURCE_DEADLINE), STALE_REFRESH_BUDGET)
+        to_fetch[name] = (fn, default)
+
+    def _save_late(name: str, value: Any) -> None:
+        if _has_data(value):
+            save_snapshot(name, value, snaps[name])
+            METRICS.count("snapshot.late_saved")
+            logger.info(f"[Snapshot] {name}: late refresh saved for the next run")
+
+    fetched = run_fetch_stage(to_fetch, deadlines=deadlines, on_late=_save_late)
+    for name, value in fetched.items():
+        snap = snaps[name]
+        if _has_data(value):
+            results[name] = value
+            save_snapshot(name, value, snap)
+        elif snap:
+            age = (now - snap["saved_at"]) / 60
+            logger.warning(f"[Snapshot] {name}: serving last good result ({age:.0f} min old)")
+            METRICS.count("snapshot.fallback")
+            results[name] = snap["data"]
+        else:
+            results[name] = value
 
-    # Most active / top movers
-    proxy_quotes = []
-    for sym in ACTIVE_PROXY:
-        q = _finnhub_quote(sym)
-        if q:
-            proxy_quotes.append(q)
-    proxy_quotes.sort(key=lambda x: abs(x['change_pct']), reverse=True)
-    most_active = proxy_quotes[:10]
+    logger.info(f"[Snapshot] {len(jobs) - len(to_fetch)} fresh, {len(to_fetch)} fetched")
+    return results
 
-    # AI watchlist
-    ai_stocks = []
-    for symbol, display in AI_WATCHLIST:
-        q = _finnhub_quote(symbol)
-        if q:
-            q["display"] = display
-            ai_stocks.append(q)
 
-    return {"most_active": most_active, "ai_watchlist": ai_stocks}
+def page_jobs() -> dict[str, tuple[Callable[[], Any], Any]]:
+    """Every page source as {name: (fetch callable, default)}, highest priority first."""
+    jobs: dict[str, tuple[Callable[[], Any], Any]] = {}
+    for name in page_sources():
+        spec = source_spec(name)
+        jobs[name] = (partial(fetch_source, spec), spec.get("default", []))
+    return jobs
+
+
+def assemble_page_data(results: dict[str, Any]) -> dict[str, Any]:
+    """
+    Per-source results -> the dict render_page takes: nyt/<section> grouped
+    under nyt, and sources with a "title" (generic feeds) under feeds.
+    """
+    feeds = {k for k in results if source_setting(k, "title")}
+    data = {k: v for k, v in results.items() if not k.startswith("nyt/") and k not in feeds}
+    data["nyt"] = {s: results.get(f"nyt/{s}", []) for s in NYT_SECTIONS}
+    data["feeds"] = {k: results[k] for k in results if k in feeds}
+    return dedupe_page_data(data)
+
+
+def fetch_all() -> dict[str, Any]:
+    """
+    Fetches every source for the page at once, backed by last-good snapshots.
+    Returns weather, nyt, buffalo, bbc, cnbc, sports, nyt_sports, stocks and feeds.
+    """
+    jobs = page_jobs()
+    return assemble_page_data(fetch_with_snapshots(jobs, deadlines=source_deadlines(list(jobs))))
 
 
 # ─────────────────────────────────────────────
-#  SPORTS  (NBA / NHL public APIs)
+#  HEADLINE DEDUP
 # ─────────────────────────────────────────────
 
-def nba_team_games(team_id: str, date_str: str) -> list[dict]:
-    url = (f"https://stats.nba.com/stats/scoreboardV2"
-           f"?DayOffset=0&LeagueID=00&gameDate={date_str}")
-    headers = {"User-Agent": "Mozilla/5.0",
-               "Referer": "https://www.nba.com/", "Accept": "application/json"}
-    try:
-        res = requests.get(url, headers=headers, timeout=8)
-        res.raise_for_status()
-        data = res.json()
-        gh  = next(r for r in data['resultSets'] if r['name'] == 'GameHeader')
-        ls  = next(r for r in data['resultSets'] if r['name'] == 'LineScore')
-        ghi = {h: i for i, h in enumerate(gh['headers'])}
-        lsi = {h: i for i, h in enumerate(ls['headers'])}
-        games = []
-        for row in gh['rowSet']:
-            gid  = row[ghi['GAME_ID']]
-            hid  = str(row[ghi['HOME_TEAM_ID']])
-            vid  = str(row[ghi['VISITOR_TEAM_ID']])
-            status = row[ghi['GAME_STATUS_TEXT']]
-            if team_id not in (hid, vid):
-                continue
-            scores = {}
-            for lr in ls['rowSet']:
-                if lr[lsi['GAME_ID']] == gid:
-                    tid = str(lr[lsi['TEAM_ID']])
-                    scores[tid] = {"abbr": lr[lsi['TEAM_ABBREVIATION']],
-                                   "pts": lr[lsi['PTS']]}
-            games.append({
-                "home": scores.get(hid, {}).get("abbr", "?"),
-                "home_pts": scores.get(hid, {}).get("pts"),
-                "visitor": scores.get(vid, {}).get("abbr", "?"),
-                "visitor_pts": scores.get(vid, {}).get("pts"),
-                "status": status.strip(), "date": date_str,
-            })
-        return games
-    except Exception as e:
-        logger.error(f"[NBA] {team_id} on {date_str}: {e}")
-        return []
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have he her his in is it its of on or "
+    "over says she than that the their they this to was were will with after into "
+    "new more up out who what why how about but not no we you our".split()
+)
+def shingles(title: str, summary: str = "") -> frozenset[str]:
+    """Content words of a headline + summary, tags and entities stripped."""
+    text = html.unescape(_TAG_RE.sub(" ", f"{title} {summary}")).lower()
+    return frozenset(w for w in _WORD_RE.findall(text)
+                     if w not in _STOPWORDS and len(w) > 1)
 
 
-def nhl_team_games(team_id: str, date_str: str) -> list[dict]:
-    try:
-        res = requests.get(
-            f"https://api-web.nhle.com/v1/score/{date_str}", timeout=8
-        )
-        res.raise_for_status()
-        games = []
-        for g in res.json().get("games", []):
-            hid = str(g.get("homeTeam", {}).get("id", ""))
-            aid = str(g.get("awayTeam", {}).get("id", ""))
-            if team_id not in (hid, aid):
-                continue
-            state = g.get("gameState", "")
-            if state in ("OFF", "FINAL"):
-                status = "Final"
-            elif state in ("LIVE", "CRIT"):
-                status = f"Live – P{g.get('period','')}"
-            else:
-                try:
-                    dt = datetime.strptime(
-                        g.get("startTimeUTC",""), "%Y-%m-%dT%H:%M:%SZ"
-                    ).replace(tzinfo=ZoneInfo("UTC"))
-                    status = dt.astimezone(
-                        ZoneInfo("America/New_York")
-                    ).strftime("%-I:%M %p ET")
-                except Exception:
-                    status = "Scheduled"
-            home = g.get("homeTeam", {})
-            away = g.get("awayTeam", {})
-            games.append({
-                "home": home.get("abbrev","?"), "home_pts": home.get("score"),
-                "visitor": away.get("abbrev","?"), "visitor_pts": away.get("score"),
-                "status": status, "date": date_str,
-            })
-        return games
-    except Exception as e:
-        logger.error(f"[NHL] {team_id} on {date_str}: {e}")
-        return []
+@lru_cache(maxsize=65536)
+def _word_hashes(word: str) -> tuple[int, ...]:
+    """DEDUP_BANDS * DEDUP_ROWS independent 32-bit hashes of one word."""
+    import struct
+    n = DEDUP_BANDS * DEDUP_ROWS
+    return struct.unpack(f"<{n}I", hashlib.shake_128(word.encode()).digest(4 * n))
 
 
-def fetch_all_sports_data() -> list[dict]:
-    now       = datetime.now(ZoneInfo("America/New_York"))
-    yesterday = (now - timedelta(days=1)).strftime("%Y-%m-%d")
-    today     = now.strftime("%Y-%m-%d")
-    tomorrow  = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-    results = []
-    for key, info in TRACKED_TEAMS.items():
-        entry = {"display": info["display"], "games": []}
-        if info["league"] == "nba":
-            for d in [yesterday, today, tomorrow]:
-                entry["games"].extend(nba_team_games(info["nba_id"], d))
+@lru_cache(maxsize=8192)
+def minhash(words: frozenset[str]) -> tuple[int, ...]:
+    """
+    DEDUP_BANDS * DEDUP_ROWS MinHash signature of a non-empty word set: the
+    per-position minimum of each word's independent hashes. Both levels are
+    memoized, so batch runs sign each distinct word and story once.
+    """
+    return tuple(map(min, zip(*map(_word_hashes, words))))
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def near_duplicate_groups(texts: list[tuple[str, str]],
+                          threshold: float = DEDUP_THRESHOLD) -> list[list[int]]:
+    """
+    Indexes of `texts` (title, summary) grouped into near-duplicate clusters,
+    each sorted ascending and the clusters ordered by their first index.
+    MinHash + banded LSH finds candidate pairs in roughly linear time (buckets
+    are capped at DEDUP_BUCKET_CAP); each candidate is confirmed with an exact
+    Jaccard check before being merged.
+    """
+    words = [shingles(t, s) for t, s in texts]
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets: dict[tuple, list[int]] = {}
+    for i, w in enumerate(words):
+        if not w:
+            continue
+        sig = minhash(w)
+        for band in range(DEDUP_BANDS):
+            key = (band, *sig[band * DEDUP_ROWS:(band + 1) * DEDUP_ROWS])
+            bucket = buckets.setdefault(key, [])
+            for j in bucket:
+                ri, rj = find(i), find(j)
+                if ri != rj and _jaccard(w, words[j]) >= threshold:
+                    parent[max(ri, rj)] = min(ri, rj)
+            if len(bucket) < DEDUP_BUCKET_CAP:
+                bucket.append(i)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values())
+
+
+def dedupe_page_data(data: dict[str, Any],
+                     keys: Optional[set[str]] = None) -> dict[str, Any]:
+    """
+    Merges near-duplicate stories across DEDUP_SOURCES (limited to `keys`,
+    e.g. the sections a profile actually shows). The first copy (by source
+    order, then position) stays where it is and gains an "also" list of
+    {"source", "url"} for the others, which are dropped from their lists.
+    A list that would lose every story keeps its first one, so its section
+    doesn't read as a failed fetch ("currently unavailable").
+    Returns a new dict; the input lists are left untouched.
+    """
+    lists: list[tuple[str, Optional[str], str, list[dict]]] = []
+    for key, label in DEDUP_SOURCES:
+        if keys is not None and key not in keys:
+            continue
+        value = data.get(key)
+        if isinstance(value, dict):
+            lists += [(key, section, label or source_setting(section, "label", section), items)
+                      for section, items in value.items()]
+        elif value:
+            lists.append((key, None, label, value))
+
+    flat = [(n, pos, label, item) for n, (_, _, label, items) in enumerate(lists)
+            for pos, item in enumerate(items)]
+    groups = near_duplicate_groups([
+        (item.get("title", ""), item.get("abstract") or item.get("summary", ""))
+        for *_, item in flat
+    ])
+
+    keep: dict[tuple[int, int], dict] = {}
+    merged = 0
+    for group in groups:
+        n, pos, _, first = flat[group[0]]
+        also, seen = [], {first.get("url") or first.get("link")}
+        for i in group[1:]:
+            url = flat[i][3].get("url") or flat[i][3].get("link")
+            if url not in seen:
+                seen.add(url)
+                also.append({"source": flat[i][2], "url": url})
+        keep[n, pos] = {**first, "also": also} if also else first
+        merged += len(group) - 1
+    if merged:
+        logger.info(f"[Dedup] merged {merged} duplicate stories out of {len(flat)}")
+    METRICS.count("dedup.merged", merged)
+
+    out = dict(data)
+    for n, (key, section, _, items) in enumerate(lists):
+        kept = [keep[n, pos] for pos in range(len(items)) if (n, pos) in keep] or items[:1]
+        if section is None:
+            out[key] = kept
         else:
-            for d in [yesterday, today, tomorrow]:
-                entry["games"].extend(nhl_team_games(info["nhl_id"], d))
-        results.append(entry)
-    return results
+            out[key] = {**out[key], section: kept}
+    return out
 
 
 # ─────────────────────────────────────────────
@@ -330,12 +2313,38 @@ def truncate(text: str, limit: int = 140) -> str:
     return text[:limit] + ('...' if len(text) > limit else '')
 
 
+def render_also(item: dict) -> str:
+    """"Also: BBC · CNBC" links for a story merged from several sources."""
+    if not item.get("also"):
+        return ""
+    links = " · ".join(
+        f"<a href='{a['url']}' target='_blank' class='hover:underline'>{a['source']}</a>"
+        for a in item["also"]
+    )
+    return f"<p class='text-xs text-gray-400 mt-1'>Also: {links}</p>"
+
+
 def _change_style(pct: float) -> tuple[str, str]:
     if pct > 0:   return "▲", "text-green-600"
     elif pct < 0: return "▼", "text-red-600"
     return "–", "text-gray-400"
 
 
+def render_sparkline(values: list[float], cls: str, width: int = 40, height: int = 12) -> str:
+    """Inline SVG polyline of `values`, drawn in the text colour of `cls`."""
+    if len(values) < 2:
+        return ""
+    lo, hi = min(values), max(values)
+    span = (hi - lo) or 1.0
+    step = width / (len(values) - 1)
+    points = " ".join(f"{i * step:.1f},{height - 1 - (v - lo) / span * (height - 2):.1f}"
+                      for i, v in enumerate(values))
+    return (f"<svg class='{cls} shrink-0' width='{width}' height='{height}' "
+            f"viewBox='0 0 {width} {height}' aria-hidden='true'>"
+            f"<polyline points='{points}' fill='none' stroke='currentColor' "
+            f"stroke-width='1'/></svg>")
+
+
 def render_stock_row(q: dict, label: Optional[str] = None) -> str:
     arrow, cls = _change_style(q['change_pct'])
     name = label or q['symbol']
@@ -344,6 +2353,7 @@ def render_stock_row(q: dict, label: Optional[str] = None) -> str:
         f"border-b border-gray-100 last:border-0'>"
         f"<span class='font-mono font-bold text-gray-800 w-14 shrink-0'>{q['symbol']}</span>"
         f"<span class='text-gray-500 truncate flex-1 px-1 text-[10px]'>{name}</span>"
+        f"{render_sparkline(q.get('spark', []), cls)}"
         f"<span class='font-semibold text-gray-900 w-14 text-right'>${q['price']:,.2f}</span>"
         f"<span class='{cls} font-bold w-14 text-right whitespace-nowrap'>"
         f"{arrow}{abs(q['change_pct']):.2f}%</span>"
@@ -397,11 +2407,33 @@ def render_cnbc(articles: list[dict]) -> str:
             f"class='text-gray-900 font-bold hover:underline block leading-tight mb-1'>"
             f"{item['title']}</a>"
             f"<p class='text-gray-700 text-xs font-serif leading-snug'>{summary}</p>"
+            f"{render_also(item)}"
             f"</div>"
         )
     return html
 
 
+def render_feeds(feeds: dict[str, list[dict]]) -> str:
+    """Every generic SOURCES feed (one with a "title"), in registry order."""
+    html = ""
+    for name, items in feeds.items():
+        if not items:
+            continue
+        html += (f"<h2 class='text-xl font-serif font-bold mt-8 mb-4 border-b "
+                 f"border-gray-200 pb-1 uppercase'>{source_setting(name, 'title', name)}</h2>")
+        for item in items:
+            summary = truncate(item.get('summary') or item.get('abstract', ''), 180)
+            html += (
+                f"<div class='mb-6'>"
+                f"<a href='{item.get('link') or item.get('url')}' target='_blank' "
+                f"class='text-gray-900 font-bold hover:underline'>{item['title']}</a>"
+                f"<p class='text-gray-600 text-sm mt-1'>{summary}</p>"
+                f"{render_also(item)}"
+                f"</div>"
+            )
+    return html
+
+
 def render_nyt(nyt_data: dict[str, list[dict]]) -> str:
     section_titles = {
         "home":     "Global News",
@@ -425,6 +2457,7 @@ def render_nyt(nyt_data: dict[str, list[dict]]) -> str:
                 f"<a href='{item['url']}' target='_blank' "
                 f"class='text-blue-800 font-bold hover:underline'>{item['title']}</a>"
                 f"<p class='text-gray-600 text-sm mt-1'>{abstract}</p>"
+                f"{render_also(item)}"
                 f"</div>"
             )
     return html
@@ -445,14 +2478,15 @@ def render_nyt_sports(articles: list[dict]) -> str:
             f"class='text-gray-900 font-bold hover:underline block leading-tight mb-1'>"
             f"{item['title']}</a>"
             f"<p class='text-gray-700 text-xs font-serif leading-snug'>{abstract}</p>"
+            f"{render_also(item)}"
             f"</div>"
         )
     return html
 
 
-def render_buffalo(articles: list[dict]) -> str:
-    html = ("<h2 class='text-xl font-serif font-bold mt-8 mb-4 border-b border-gray-200 "
-            "pb-1 uppercase'>Buffalo Local News (WIVB)</h2>")
+def render_buffalo(articles: list[dict], title: str = LOCAL_NEWS_TITLE) -> str:
+    html = (f"<h2 class='text-xl font-serif font-bold mt-8 mb-4 border-b border-gray-200 "
+            f"pb-1 uppercase'>{title}</h2>")
     if not articles:
         return html + "<p class='text-sm text-gray-400 italic'>Local news currently unavailable.</p>"
     for item in articles:
@@ -460,6 +2494,7 @@ def render_buffalo(articles: list[dict]) -> str:
             f"<div class='mb-4'>"
             f"<a href='{item['link']}' target='_blank' "
             f"class='text-red-700 font-bold hover:underline'>{item['title']}</a>"
+            f"{render_also(item)}"
             f"</div>"
         )
     return html
@@ -478,21 +2513,43 @@ def render_bbc(articles: list[dict]) -> str:
             f"class='text-gray-900 font-bold hover:underline block leading-tight mb-1'>"
             f"{item['title']}</a>"
             f"<p class='text-gray-700 text-xs font-serif leading-snug'>{summary}</p>"
+            f"{render_also(item)}"
             f"</div>"
         )
     return html
 
 
-def render_weather(weather: Optional[dict]) -> str:
+def _hour_label(start: str) -> str:
+    hour = datetime.fromisoformat(start).hour
+    return f"{hour % 12 or 12}{'a' if hour < 12 else 'p'}"
+
+
+def render_hourly(hourly: list[dict]) -> str:
+    """Compact strip of the next few hours: label over temperature."""
+    if not hourly:
+        return ""
+    cells = "".join(
+        f"<div class='text-center'>"
+        f"<p class='text-[10px] text-blue-600'>{_hour_label(h['start'])}</p>"
+        f"<p class='text-xs font-bold'>{h['temp']}°</p></div>"
+        for h in hourly
+    )
+    return (f"<div class='flex justify-between mt-3 pt-2 border-t border-blue-200'>"
+            f"{cells}</div>")
+
+
+def render_weather(weather: list[dict]) -> str:
     if not weather:
         return "<p class='text-sm text-gray-400 italic mt-6'>Weather unavailable.</p>"
-    return (
+    return "".join(
         f"<div class='mt-6 p-4 bg-blue-50 border border-blue-200 rounded-lg'>"
         f"<h3 class='text-xs font-black uppercase tracking-widest text-blue-800 mb-1'>"
-        f"Buffalo Weather</h3>"
-        f"<p class='text-lg font-bold'>{weather['temp']}°{weather['unit']}</p>"
-        f"<p class='text-[10px] text-blue-600 font-medium uppercase'>{weather['forecast']}</p>"
+        f"{w['city']} Weather</h3>"
+        f"<p class='text-lg font-bold'>{w['temp']}°{w['unit']}</p>"
+        f"<p class='text-[10px] text-blue-600 font-medium uppercase'>{w['forecast']}</p>"
+        f"{render_hourly(w.get('hourly', []))}"
         f"</div>"
+        for w in weather
     )
 
 
@@ -517,6 +2574,20 @@ def _score_line(game: dict) -> str:
     )
 
 
+def _recent_line(recent: list[dict]) -> str:
+    """"Last 5: W L W …" from history, oldest first, with the score on hover."""
+    if not recent:
+        return ""
+    marks = "".join(
+        f"<span class='{'text-green-700' if r['won'] else 'text-red-600'} font-bold px-1' "
+        f"title='{r['date']} {'vs' if r['home'] else '@'} {r['opponent']} {r['score']}'>"
+        f"{'W' if r['won'] else 'L'}</span>"
+        for r in reversed(recent)
+    )
+    return (f"<p class='text-[9px] text-gray-400 uppercase mb-1'>"
+            f"Last {len(recent)}:{marks}</p>")
+
+
 def render_scoreboard(sports_data: list[dict]) -> str:
     html = (
         "<div class='mt-4 p-4 bg-gray-50 border border-gray-200 rounded-lg'>"
@@ -525,12 +2596,13 @@ def render_scoreboard(sports_data: list[dict]) -> str:
     )
     any_games = False
     for team in sports_data:
-        if not team["games"]:
+        if not team["games"] and not team.get("recent"):
             continue
         any_games = True
         html += (f"<div class='mb-4'>"
                  f"<p class='text-[10px] font-bold uppercase tracking-widest "
                  f"text-gray-500 mb-1'>{team['display']}</p>")
+        html += _recent_line(team.get("recent", []))
         for game in team["games"]:
             html += _score_line(game)
         html += "</div>"
@@ -540,6 +2612,185 @@ def render_scoreboard(sports_data: list[dict]) -> str:
     return html
 
 
+# ─────────────────────────────────────────────
+#  STYLESHEET  (precompiled utility CSS)
+# ─────────────────────────────────────────────
+# The page uses Tailwind-style utility classes. Instead of shipping the
+# Tailwind runtime, page_css() collects the classes present in the rendered
+# markup and compiles just those rules, which build_layout inlines.
+
+_PALETTE = {
+    "gray":   ["#f9fafb", "#f3f4f6", "#e5e7eb", "#d1d5db", "#9ca3af",
+               "#6b7280", "#4b5563", "#374151", "#1f2937", "#111827"],
+    "red":    ["#fef2f2", "#fee2e2", "#fecaca", "#fca5a5", "#f87171",
+               "#ef4444", "#dc2626", "#b91c1c", "#991b1b", "#7f1d1d"],
+    "yellow": ["#fefce8", "#fef9c3", "#fef08a", "#fde047", "#facc15",
+               "#eab308", "#ca8a04", "#a16207", "#854d0e", "#713f12"],
+    "green":  ["#f0fdf4", "#dcfce7", "#bbf7d0", "#86efac", "#4ade80",
+               "#22c55e", "#16a34a", "#15803d", "#166534", "#14532d"],
+    "blue":   ["#eff6ff", "#dbeafe", "#bfdbfe", "#93c5fd", "#60a5fa",
+               "#3b82f6", "#2563eb", "#1d4ed8", "#1e40af", "#1e3a8a"],
+    "indigo": ["#eef2ff", "#e0e7ff", "#c7d2fe", "#a5b4fc", "#818cf8",
+               "#6366f1", "#4f46e5", "#4338ca", "#3730a3", "#312e81"],
+}
+_SHADES = ["50", "100", "200", "300", "400", "500", "600", "700", "800", "900"]
+_FONT_SIZES = {"xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"),
+               "base": ("1rem", "1.5rem"), "lg": ("1.125rem", "1.75rem"),
+               "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+               "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"),
+               "5xl": ("3rem", "1")}
+_SPACING_PROPS = {"p": ["padding"], "px": ["padding-left", "padding-right"],
+                  "py": ["padding-top", "padding-bottom"], "pt": ["padding-top"],
+                  "pr": ["padding-right"], "pb": ["padding-bottom"], "pl": ["padding-left"],
+                  "m": ["margin"], "mx": ["margin-left", "margin-right"],
+                  "my": ["margin-top", "margin-bottom"], "mt": ["margin-top"],
+                  "mr": ["margin-right"], "mb": ["margin-bottom"], "ml": ["margin-left"],
+                  "gap": ["gap"], "w": ["width"], "h": ["height"]}
+_BORDER_SIDES = {"": ["border-width"], "t": ["border-top-width"],
+                 "r": ["border-right-width"], "b": ["border-bottom-width"],
+                 "l": ["border-left-width"]}
+_STATIC_UTILITIES = {
+    "block": "display:block", "flex": "display:flex", "grid": "display:grid",
+    "hidden": "display:none", "flex-1": "flex:1 1 0%", "shrink-0": "flex-shrink:0",
+    "items-center": "align-items:center", "justify-between": "justify-content:space-between",
+    "mx-auto": "margin-left:auto;margin-right:auto", "min-h-screen": "min-height:100vh",
+    "max-w-6xl": "max-width:72rem",
+    "font-sans": "font-family:ui-sans-serif,system-ui,-apple-system,'Segoe UI',Roboto,"
+                 "'Helvetica Neue',Arial,sans-serif",
+    "font-serif": "font-family:ui-serif,Georgia,Cambria,'Times New Roman',Times,serif",
+    "font-mono": "font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace",
+    "font-medium": "font-weight:500", "font-semibold": "font-weight:600",
+    "font-bold": "font-weight:700", "font-black": "font-weight:900",
+    "italic": "font-style:italic", "uppercase": "text-transform:uppercase",
+    "underline": "text-decoration-line:underline",
+    "text-left": "text-align:left", "text-center": "text-align:center",
+    "text-right": "text-align:right", "whitespace-nowrap": "white-space:nowrap",
+    "truncate": "overflow:hidden;text-overflow:ellipsis;white-space:nowrap",
+    "leading-none": "line-height:1", "leading-tight": "line-height:1.25",
+    "leading-snug": "line-height:1.375", "leading-normal": "line-height:1.5",
+    "tracking-tighter": "letter-spacing:-0.05em", "tracking-tight": "letter-spacing:-0.025em",
+    "tracking-wide": "letter-spacing:0.025em", "tracking-widest": "letter-spacing:0.1em",
+    "rounded": "border-radius:0.25rem", "rounded-lg": "border-radius:0.5rem",
+    "rounded-full": "border-radius:9999px",
+    "rounded-r": "border-top-right-radius:0.25rem;border-bottom-right-radius:0.25rem",
+    "shadow": "box-shadow:0 1px 3px 0 rgb(0 0 0/.1),0 1px 2px -1px rgb(0 0 0/.1)",
+    "shadow-2xl": "box-shadow:0 25px 50px -12px rgb(0 0 0/.25)",
+    "bg-white": "background-color:#fff", "bg-black": "background-color:#000",
+    "text-white": "color:#fff", "text-black": "color:#000",
+    "animate-pulse": "animation:pulse 2s cubic-bezier(.4,0,.6,1) infinite",
+}
+_KEYFRAMES = {"animate-pulse": "@keyframes pulse{50%{opacity:.5}}"}
+_PREFLIGHT = (
+    "*,::before,::after{box-sizing:border-box;border:0 solid #e5e7eb}"
+    "html{line-height:1.5;-webkit-text-size-adjust:100%;"
+    "font-family:ui-sans-serif,system-ui,-apple-system,'Segoe UI',Roboto,sans-serif}"
+    "body{margin:0;line-height:inherit}"
+    "h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit;margin:0}"
+    "p,ul,ol{margin:0}ul,ol{list-style:none;padding:0}"
+    "a{color:inherit;text-decoration:inherit}"
+    "img,svg{display:block;max-width:100%}"
+)
+# variant prefix -> (selector suffix, wrapping at-rule)
+_VARIANTS = {"hover": (":hover", None), "last": (":last-child", None),
+             "md": ("", "@media (min-width:768px)")}
+_CLASS_ATTR_RE = re.compile(r"""class=(?:'([^']*)'|"([^"]*)")""")
+_CSS_ESCAPE_RE = re.compile(r"([^a-zA-Z0-9_-])")
+
+
+def _color(spec: str) -> Optional[str]:
+    """gray-500 / red-50/30 -> a CSS color, or None if not in the palette."""
+    spec, _, alpha = spec.partition("/")
+    family, _, shade = spec.rpartition("-")
+    if family not in _PALETTE or shade not in _SHADES:
+        return None
+    hexval = _PALETTE[family][_SHADES.index(shade)]
+    if not alpha:
+        return hexval
+    r, g, b = (int(hexval[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgb({r} {g} {b}/{int(alpha) / 100:g})"
+
+
+def _length(value: str) -> Optional[str]:
+    if value == "auto":
+        return "auto"
+    try:
+        n = float(value)
+    except ValueError:
+        return None
+    return "0" if n == 0 else f"{n / 4:g}rem"
+
+
+def utility_css(name: str) -> Optional[tuple[int, str]]:
+    """
+    (sort rank, declarations) for one utility class without variants, or
+    None if it isn't supported. The rank orders broader rules first so that
+    e.g. border-l-4 overrides border and pl-6 overrides p-6, as in Tailwind.
+    """
+    if name in _STATIC_UTILITIES:
+        return 0, _STATIC_UTILITIES[name]
+    head, _, rest = name.partition("-")
+    if name.startswith("text-["):
+        return 1, f"font-size:{name[6:-1]}"
+    if head == "text" and rest in _FONT_SIZES:
+        size, line = _FONT_SIZES[rest]
+        return 1, f"font-size:{size};line-height:{line}"
+    if head in ("text", "bg") and _color(rest):
+        return 2, f"{'color' if head == 'text' else 'background-color'}:{_color(rest)}"
+    if head == "border":
+        side, width = "", rest
+        if rest[:1] in ("t", "r", "b", "l") and rest[1:2] in ("", "-"):
+            side, width = rest[0], rest[2:]
+        if width == "" or width.isdigit():
+            px = f"{width or 1}px" if width != "0" else "0"
+            return 3 + (side != ""), ";".join(f"{p}:{px}" for p in _BORDER_SIDES[side])
+        if _color(rest):
+            return 5, f"border-color:{_color(rest)}"
+    if head == "opacity" and rest.isdigit():
+        return 0, f"opacity:{int(rest) / 100:g}"
+    if head == "grid" and rest.startswith("cols-"):
+        return 0, f"grid-template-columns:repeat({rest[5:]},minmax(0,1fr))"
+    if head == "col" and rest.startswith("span-"):
+        return 0, f"grid-column:span {rest[5:]}/span {rest[5:]}"
+    if head in _SPACING_PROPS and _length(rest):
+        rank = 6 if len(head) == 1 or head in ("gap", "w", "h") else 7 if head[1] in "xy" else 8
+        return rank, ";".join(f"{p}:{_length(rest)}" for p in _SPACING_PROPS[head])
+    return None
+
+
+@lru_cache(maxsize=64)
+def build_css(classes: frozenset[str]) -> str:
+    """Minified stylesheet (preflight + one rule per class) for a set of utility classes."""
+    rules: list[tuple[int, int, str, str]] = []
+    at_rules: dict[str, list[tuple[int, int, str, str]]] = {}
+    extras: set[str] = set()
+    for cls in classes:
+        *variants, name = cls.split(":")
+        compiled = utility_css(name)
+        if compiled is None or any(v not in _VARIANTS for v in variants):
+            logger.warning(f"[CSS] no rule for class {cls!r}")
+            continue
+        rank, decls = compiled
+        selector = "." + _CSS_ESCAPE_RE.sub(r"\\\1", cls) + "".join(
+            _VARIANTS[v][0] for v in variants)
+        at = next((_VARIANTS[v][1] for v in variants if _VARIANTS[v][1]), None)
+        entry = (len(variants), rank, selector, decls)
+        (at_rules.setdefault(at, []) if at else rules).append(entry)
+        if name in _KEYFRAMES:
+            extras.add(_KEYFRAMES[name])
+    css = _PREFLIGHT + "".join(sorted(extras))
+    css += "".join(f"{sel}{{{decls}}}" for _, _, sel, decls in sorted(rules))
+    for at, entries in sorted(at_rules.items()):
+        css += at + "{" + "".join(f"{sel}{{{decls}}}" for _, _, sel, decls in sorted(entries)) + "}"
+    return css
+
+
+def page_css(markup: str) -> str:
+    """The compiled stylesheet for every class used in `markup`."""
+    classes = {c for m in _CLASS_ATTR_RE.finditer(markup)
+               for c in (m.group(1) or m.group(2) or "").split()}
+    return build_css(frozenset(classes))
+
+
 # ─────────────────────────────────────────────
 #  LAYOUT
 # ─────────────────────────────────────────────
@@ -553,15 +2804,17 @@ def build_layout(
     sports_html:     str,
     cnbc_html:       str,
     stocks_html:     str,
+    feeds_html:      str = "",
+    css_markup:      str = "",
+    tail:            str = "",
 ) -> str:
-    now = datetime.now(ZoneInfo("America/New_York"))
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <script src="https://cdn.tailwindcss.com"></script>
-</head>
-<body class="bg-gray-100 text-gray-900 font-sans leading-snug">
+    """
+    The full page. `css_markup` is markup rendered elsewhere (lazy fragments)
+    whose classes the inline stylesheet must also cover; `tail` goes at the
+    end of <body>.
+    """
+    now = datetime.now(_zone("America/New_York"))
+    body = f"""<body class="bg-gray-100 text-gray-900 font-sans leading-snug">
     <div class="max-w-6xl mx-auto bg-white min-h-screen shadow-2xl">
         <header class="p-8 bg-black text-white text-center">
             <h1 class="text-5xl font-serif font-black italic tracking-tighter uppercase mb-2">The Daily Brief</h1>
@@ -574,6 +2827,7 @@ def build_layout(
                 {cnbc_html}
                 {sports_html}
                 {news_html}
+                {feeds_html}
             </div>
             <div class="md:col-span-1 border-l border-gray-100 pl-6">
                 {weather_html}
@@ -582,38 +2836,1032 @@ def build_layout(
             </div>
         </div>
     </div>
-</body>
+    {tail}
+</body>"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <style>{page_css(body + css_markup)}</style>
+</head>
+{body}
 </html>"""
 
 
+# ─────────────────────────────────────────────
+#  INCREMENTAL RENDER
+# ─────────────────────────────────────────────
+
+_code_fingerprint: Optional[str] = None
+
+
+def _renderer_fingerprint() -> str:
+    """Hash of this file, so fragments rendered by older code are never reused."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        with open(__file__, "rb") as f:
+            _code_fingerprint = hashlib.sha256(f.read()).hexdigest()[:16]
+    return _code_fingerprint
+
+
+def _data_hash(section: str, data: Any) -> str:
+    blob = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(
+        f"{_renderer_fingerprint()}|{section}|{blob}".encode("utf-8")
+    ).hexdigest()
+
+
+def page_sections(data: dict[str, Any]) -> dict[str, tuple[Callable[[Any], str], Any]]:
+    """Layout section -> (renderer, that section's slice of the page data)."""
+    return {
+        "news":       (render_nyt,            data["nyt"]),
+        "local":      (render_buffalo,        data["buffalo"]),
+        "bbc":        (render_bbc,            data["bbc"]),
+        "weather":    (render_weather,        data["weather"]),
+        "scoreboard": (render_scoreboard,     data["sports"]),
+        "sports":     (render_nyt_sports,     data["nyt_sports"]),
+        "cnbc":       (render_cnbc,           data["cnbc"]),
+        "stocks":     (render_stocks_sidebar, data["stocks"]),
+        "feeds":      (render_feeds,          data.get("feeds", {})),
+    }
+
+
+def render_sections(data: dict[str, Any]) -> tuple[dict[str, str], dict[str, str], list[str]]:
+    """
+    Renders each layout section, reusing the cached fragment when the
+    section's input data hashes the same as on the previous run.
+    Returns (html by section, hash by section, names of changed sections).
+    """
+    sections = page_sections(data)
+    cache = load_json(cache_path(FRAGMENT_CACHE_FILE), {})
+    html: dict[str, str]   = {}
+    hashes: dict[str, str] = {}
+    changed: list[str]     = []
+    for name, (render, section_data) in sections.items():
+        with METRICS.timed("render", name) as m:
+            digest = _data_hash(name, section_data)
+            hit    = cache.get(name)
+            if hit and hit.get("hash") == digest:
+                html[name] = hit["html"]
+                m["cache"] = "hit"
+            else:
+                html[name] = render(section_data)
+                cache[name] = {"hash": digest, "html": html[name]}
+                changed.append(name)
+                m["cache"] = "miss"
+            m["bytes"] = len(html[name])
+        hashes[name] = digest
+
+    if changed:
+        save_json(cache_path(FRAGMENT_CACHE_FILE), cache)
+    return html, hashes, changed
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Atomically replaces path with content unless it already holds exactly that."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return True
+
+
+def render_page(data: dict[str, Any], output: str = OUTPUT_FILE, lazy: bool = False) -> dict:
+    """
+    Renders the page incrementally and writes it (minified, with .gz/.br
+    variants) only if a section changed. The header date alone does not
+    count as a change, so identical news does not produce a new commit.
+    With `lazy`, the page is a shell and the sections outside SHELL_SECTIONS
+    are written as fragment files (see write_fragments). Also writes the
+    compact data file. Writes and returns a change report.
+    """
+    html, hashes, changed = render_sections(data)
+    out_dir = os.path.dirname(output)
+    os.makedirs(out_dir or ".", exist_ok=True)
+    previous = load_json(os.path.join(out_dir, CHANGE_REPORT_FILE), {})
+    fragments = write_fragments(out_dir, html) if lazy else {}
+    written = False
+    artifacts: dict = {}
+    if changed or not os.path.exists(output) or previous.get("fragments", {}) != fragments:
+        with METRICS.timed("render", "build_layout") as m:
+            sections = {f"{name}_html": frag for name, frag in html.items()}
+            css_markup = ""
+            if fragments:
+                css_markup = "".join(html[name] for name in fragments)
+                sections.update({f"{name}_html": fragment_placeholder(name, path)
+                                 for name, path in fragments.items()})
+            page = minify_html(build_layout(**sections, css_markup=css_markup,
+                                            tail=_LAZY_LOADER if fragments else ""))
+            m["bytes"] = len(page)
+        artifacts = write_artifacts(output, page)
+        written = artifacts["written"]
+    else:
+        artifacts = load_json(output + HEADERS_SUFFIX, {})
+    revision = write_data_file(
+        os.path.join(out_dir, DATA_FILE),
+        {name: section_data for name, (_, section_data) in page_sections(data).items()},
+        hashes,
+    )
+
+    report = {
+        "generated_at": datetime.now(_zone("America/New_York")).isoformat(),
+        "output":       output,
+        "written":      written,
+        "revision":     revision,
+        "changed":      changed,
+        "fragments":    fragments,
+        "bytes":        {"html": artifacts.get("headers", {}).get("Content-Length"),
+                         **{enc: v["headers"]["Content-Length"]
+                            for enc, v in artifacts.get("variants", {}).items()}},
+        "sections":     {name: {"hash": digest, "changed": name in changed}
+                         for name, digest in hashes.items()},
+    }
+    save_json(os.path.join(out_dir, CHANGE_REPORT_FILE), report)
+    return report
+
+
+# ─────────────────────────────────────────────
+#  OUTPUT ARTIFACTS
+# ─────────────────────────────────────────────
+
+_INTERTAG_WS_RE = re.compile(r">\s*\n\s*<")
+_WS_RUN_RE      = re.compile(r"\s{2,}")
+
+
+def minify_html(page: str) -> str:
+    """
+    Drops the layout's indentation and line breaks between tags and folds
+    remaining whitespace runs (the page has no <pre>/<textarea>, so browsers
+    would collapse them anyway).
+    """
+    return _WS_RUN_RE.sub(" ", _INTERTAG_WS_RE.sub("><", page)).strip()
+
+
+def compress_variants(content: bytes) -> dict[str, bytes]:
+    """Content-Encoding -> compressed body: gzip always, br when brotli is installed."""
+    import gzip
+    variants = {"gzip": gzip.compress(content, GZIP_LEVEL, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        logger.debug("[Output] brotli not installed, skipping .br")
+    else:
+        variants["br"] = brotli.compress(content, quality=BROTLI_QUALITY)
+    return variants
+
+
+_VARIANT_SUFFIX = {"gzip": ".gz", "br": ".br"}
+
+
+def write_artifacts(path: str, content: str,
+                    content_type: str = "text/html; charset=utf-8",
+                    cache_control: str = "no-cache") -> dict:
+    """
+    Writes `content` to path plus precompressed .gz/.br siblings and a
+    <path>.headers.json describing each file's Content-Type, Content-Length,
+    Content-Encoding and ETag. Compression is skipped when path is unchanged
+    and its variants already exist. Returns the headers metadata.
+    """
+    raw = content.encode("utf-8")
+    changed = write_if_changed(path, content)
+    etag = f'"{hashlib.sha256(raw).hexdigest()[:20]}"'
+    meta = {"file": os.path.basename(path), "written": changed, "variants": {}, "headers": {
+        "Content-Type": content_type, "Content-Length": len(raw), "ETag": etag,
+        "Cache-Control": cache_control, "Vary": "Accept-Encoding",
+    }}
+    old = load_json(path + HEADERS_SUFFIX, {})
+    have = old.get("headers", {}).get("ETag") == etag and all(
+        os.path.exists(os.path.join(os.path.dirname(path), v["file"]))
+        for v in old.get("variants", {}).values()
+    )
+    if have and old.get("variants"):
+        meta["variants"] = old["variants"]
+        return meta
+    with METRICS.timed("render", "compress", bytes=len(raw)) as m:
+        for encoding, body in compress_variants(raw).items():
+            variant = path + _VARIANT_SUFFIX[encoding]
+            with open(f"{variant}.tmp", "wb") as f:
+                f.write(body)
+            os.replace(f"{variant}.tmp", variant)
+            meta["variants"][encoding] = {
+                "file": os.path.basename(variant),
+                "headers": {**meta["headers"], "Content-Encoding": encoding,
+                            "Content-Length": len(body)},
+            }
+            m[encoding] = len(body)
+    save_json(path + HEADERS_SUFFIX, meta)
+    return meta
+
+
+# Swaps each placeholder for its fragment once it comes within 600px of the
+# viewport; without IntersectionObserver every fragment is fetched at once.
+_LAZY_LOADER = (
+    "<script>(function(){"
+    "var els=document.querySelectorAll('[data-fragment]');"
+    "function load(el){fetch(el.getAttribute('data-fragment'))"
+    ".then(function(r){if(!r.ok)throw r;return r.text()})"
+    ".then(function(h){el.outerHTML=h}).catch(function(){})}"
+    "if(!('IntersectionObserver'in window)){els.forEach(load);return}"
+    "var io=new IntersectionObserver(function(entries){entries.forEach(function(e){"
+    "if(e.isIntersecting){io.unobserve(e.target);load(e.target)}})},{rootMargin:'600px 0px'});"
+    "els.forEach(function(el){io.observe(el)})})();</script>"
+)
+
+
+def fragment_placeholder(section: str, path: str) -> str:
+    """Stand-in for a lazy section; the link is the no-script fallback."""
+    return (f"<div data-fragment='{path}' class='mb-10'>"
+            f"<a href='{path}' class='text-sm text-gray-400 italic'>Loading {section}…</a></div>")
+
+
+def write_fragments(out_dir: str, html: dict[str, str]) -> dict[str, str]:
+    """
+    Writes every non-empty section outside SHELL_SECTIONS to
+    FRAGMENT_DIR/<section>.<content hash>.html (with .gz/.br variants), so
+    each file can be cached forever and changes under a new name. Files no
+    longer referenced are deleted once they've been unused for
+    FRAGMENT_KEEP, which leaves time for readers holding an older shell.
+    Returns section -> path relative to out_dir.
+    """
+    directory = os.path.join(out_dir, FRAGMENT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    paths: dict[str, str] = {}
+    for name, frag in html.items():
+        if name in SHELL_SECTIONS or not frag.strip():
+            continue
+        frag = minify_html(frag)
+        digest = hashlib.sha256(frag.encode("utf-8")).hexdigest()[:12]
+        paths[name] = f"{FRAGMENT_DIR}/{name}.{digest}.html"
+        write_artifacts(os.path.join(out_dir, paths[name]), frag,
+                        cache_control=FRAGMENT_CACHE_CONTROL)
+
+    live = {os.path.basename(p) for p in paths.values()}
+    now = time.time()
+    for entry in os.scandir(directory):
+        base = entry.name.split(".html")[0] + ".html"
+        try:
+            if base in live:
+                os.utime(entry.path, (now, now))   # last referenced
+            elif entry.stat().st_mtime < now - FRAGMENT_KEEP:
+                os.remove(entry.path)
+        except OSError:
+            pass
+    return paths
+
+
+def write_data_file(path: str, data: dict[str, Any], hashes: dict[str, str]) -> str:
+    """
+    Writes the page's per-section input data as compact JSON, each section
+    tagged with the same hash as the change report, so a client holding
+    older hashes only needs the sections that differ. Returns the revision
+    (a hash over all section hashes).
+    """
+    revision = hashlib.sha256("".join(hashes[k] for k in sorted(hashes)).encode()).hexdigest()[:20]
+    doc = {"revision": revision,
+           "sections": {name: {"hash": digest, "data": data[name]}
+                        for name, digest in hashes.items()}}
+    write_if_changed(path, json.dumps(doc, separators=(",", ":"), default=str))
+    return revision
+
+
+def section_delta(doc: dict, known: set[str]) -> dict:
+    """data.json with the data of every section whose hash is in `known` left out."""
+    return {**doc, "sections": {
+        name: s if s["hash"] not in known else {"hash": s["hash"]}
+        for name, s in doc["sections"].items()
+    }}
+
+
+# ─────────────────────────────────────────────
+#  PROFILES  (batch mode)
+# ─────────────────────────────────────────────
+
+LAYOUT_SECTIONS = ["local", "bbc", "cnbc", "sports", "news", "feeds",
+                   "weather", "scoreboard", "stocks"]
+# layout section -> the page-data key holding its stories
+SECTION_DATA = {"news": "nyt", "sports": "nyt_sports", "local": "buffalo",
+                "bbc": "bbc", "cnbc": "cnbc", "feeds": "feeds"}
+
+
+def normalize_profile(raw: dict) -> dict:
+    """
+    Fills a profile's defaults from the module configuration. Profile keys:
+      id        — required; output defaults to <batch dir>/<id>.html
+      sections  — subset of LAYOUT_SECTIONS to show
+      nyt       — NYT Top Stories sections for the news column
+      teams     — TRACKED_TEAMS keys, or {"league", "id", "display"} objects
+      keywords  — NYT sports headline filter (default: derived from teams)
+      tickers   — [[symbol, display], ...] watchlist; movers — symbols for Top Movers
+      weather   — [{"city", "lat", "lon"} | {"city", "gridpoint"}, ...] (a single
+                  object is accepted too); local — {"title", "feed"}
+    """
+    teams: dict[str, dict] = {}
+    for t in raw.get("teams", list(TRACKED_TEAMS)):
+        if isinstance(t, str):
+            teams[t] = TRACKED_TEAMS[t]
+        else:
+            key = t.get("key") or t["display"].lower().replace(" ", "-")
+            teams[key] = {f"{t['league']}_id": str(t["id"]),
+                          "display": t["display"], "league": t["league"]}
+    keywords = raw.get("keywords") or sorted({
+        w for info in teams.values()
+        for w in (info["display"].lower(), info["display"].lower().split()[-1])
+    })
+    weather = raw.get("weather", WEATHER_LOCATIONS)
+    if isinstance(weather, dict):
+        weather = [weather]
+    local   = {"title": LOCAL_NEWS_TITLE, "feed": LOCAL_NEWS_FEED, **raw.get("local", {})}
+    return {
+        "id":       raw["id"],
+        "output":   raw.get("output"),
+        "sections": [s for s in raw.get("sections", LAYOUT_SECTIONS) if s in LAYOUT_SECTIONS],
+        "nyt":      raw.get("nyt", NYT_SECTIONS),
+        "teams":    teams,
+        "keywords": [k.lower() for k in keywords],
+        "tickers":  [tuple(t) for t in raw.get("tickers", AI_WATCHLIST)],
+        "movers":   raw.get("movers", ACTIVE_PROXY),
+        "weather":  weather,
+        "local":    local,
+    }
+
+
+def load_profiles(path: str) -> list[dict]:
+    """Reads {"profiles": [...]} (or a bare list) and normalizes every entry."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return [normalize_profile(p) for p in (raw["profiles"] if isinstance(raw, dict) else raw)]
+
+
+def batch_jobs(profiles: list[dict]) -> dict[str, tuple[Callable[[], Any], Any]]:
+    """
+    One fetch job per unique upstream resource across all profiles: each NYT
+    section, local feed and weather location once, the scoreboards of every
+    league in use, and a single quote fetch over the union of all symbols.
+    The shared jobs are named after their inputs (quotes/<digest>,
+    scoreboards/<leagues>/<dates>) so a snapshot is only reused for the
+    same symbols, leagues and days.
+    """
+    def wants(section: str) -> bool:
+        return any(section in p["sections"] for p in profiles)
+
+    jobs: dict[str, tuple[Callable[[], Any], Any]] = {}
+    if wants("news"):
+        for s in dict.fromkeys(s for p in profiles for s in p["nyt"]):
+            jobs[f"nyt/{s}"] = (partial(fetch_nyt_section, s), [])
+    if wants("sports"):
+        jobs["nyt_sports_all"] = (fetch_nyt_sports_articles, [])
+    if wants("bbc"):
+        jobs["bbc"] = (fetch_bbc_middle_east, [])
+    if wants("cnbc"):
+        jobs["cnbc"] = (fetch_cnbc_business, [])
+    if wants("feeds"):
+        for name in page_sources():
+            if source_setting(name, "title"):
+                jobs[name] = (partial(fetch_source, source_spec(name)), [])
+    for p in profiles:
+        if "local" in p["sections"]:
+            feed = p["local"]["feed"]
+            jobs.setdefault(f"local/{fixture_key(feed)}", (partial(fetch_buffalo_news, feed), []))
+        if "weather" in p["sections"]:
+            for loc in p["weather"]:
+                jobs.setdefault(f"weather/{location_key(loc)}",
+                                (partial(fetch_location_weather, loc), None))
+    if wants("scoreboard"):
+        leagues = sorted({info["league"] for p in profiles for info in p["teams"].values()})
+        dates = sports_dates()
+        jobs[f"scoreboards/{'+'.join(leagues)}/{dates[0]}..{dates[-1]}"] = (
+            partial(fetch_scoreboards, leagues, dates), {})
+    if wants("stocks"):
+        symbols = sorted({s for p in profiles for s in p["movers"] + [t[0] for t in p["tickers"]]})
+        digest = hashlib.sha1(",".join(symbols).encode()).hexdigest()[:12]
+        jobs[f"quotes/{digest}"] = (partial(fetch_quotes, symbols), {})
+    return jobs
+
+
+def _shared_result(results: dict[str, Any], family: str, default: Any) -> Any:
+    """Result of the batch's single job in a family ("quotes", "scoreboards")."""
+    return next((v for k, v in results.items() if k.partition("/")[0] == family), default)
+
+
+def profile_data(profile: dict, results: dict[str, Any]) -> dict[str, Any]:
+    """One profile's render_page-shaped data, cut out of the shared batch results."""
+    shown = {SECTION_DATA[s] for s in profile["sections"] if s in SECTION_DATA}
+    return dedupe_page_data({
+        "nyt":        {s: results.get(f"nyt/{s}", []) for s in profile["nyt"]},
+        "buffalo":    results.get(f"local/{fixture_key(profile['local']['feed'])}", []),
+        "bbc":        results.get("bbc", []),
+        "cnbc":       results.get("cnbc", []),
+        "weather":    [w for w in (results.get(f"weather/{location_key(loc)}")
+                                   for loc in profile["weather"]) if w],
+        "sports":     team_games(_shared_result(results, "scoreboards", {}), profile["teams"],
+                                 sports_dates()),
+        "nyt_sports": filter_team_articles(results.get("nyt_sports_all", []),
+                                           profile["keywords"]),
+        "feeds":      {name: results[name] for name in results
+                       if source_setting(name, "title")},
+        "stocks":     build_stock_data(_shared_result(results, "quotes", {}),
+                                       profile["movers"], profile["tickers"]),
+    }, shown)
+
+
+def render_profile(profile: dict, data: dict[str, Any]) -> str:
+    """Full page for one profile; sections it doesn't list are left empty."""
+    renderers = {
+        "news":       lambda: render_nyt(data["nyt"]),
+        "local":      lambda: render_buffalo(data["buffalo"], profile["local"]["title"]),
+        "bbc":        lambda: render_bbc(data["bbc"]),
+        "weather":    lambda: render_weather(data["weather"]),
+        "scoreboard": lambda: render_scoreboard(data["sports"]),
+        "sports":     lambda: render_nyt_sports(data["nyt_sports"]),
+        "cnbc":       lambda: render_cnbc(data["cnbc"]),
+        "stocks":     lambda: render_stocks_sidebar(data["stocks"]),
+        "feeds":      lambda: render_feeds(data["feeds"]),
+    }
+    return build_layout(**{
+        f"{name}_html": render() if name in profile["sections"] else ""
+        for name, render in renderers.items()
+    })
+
+
+def _render_profile_job(job: tuple[dict, dict[str, Any]]) -> tuple[str, str, bool]:
+    """Process-pool worker: renders one profile and writes it if it changed."""
+    profile, data = job
+    output = profile["output"]
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    meta = write_artifacts(output, minify_html(render_profile(profile, data)))
+    return profile["id"], output, meta["written"]
+
+
+def run_batch(profiles: list[dict], out_dir: str = BATCH_OUTPUT_DIR,
+              workers: Optional[int] = None) -> list[dict]:
+    """
+    Fetches the union of every profile's data needs once, then renders all
+    profiles in parallel across a process pool. Returns one result per profile.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    for p in profiles:
+        p["output"] = p["output"] or os.path.join(out_dir, f"{p['id']}.html")
+
+    jobs = batch_jobs(profiles)
+    logger.info(f"[Batch] {len(profiles)} profiles need {len(jobs)} fetch jobs")
+    results = fetch_with_snapshots(jobs, deadlines=source_deadlines(list(jobs)))
+
+    with METRICS.timed("render", "batch", items=len(profiles)):
+        work = [(p, profile_data(p, results)) for p in profiles]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_render_profile_job, work, chunksize=BATCH_CHUNKSIZE))
+    written = sum(w for _, _, w in done)
+    logger.info(f"[Batch] rendered {len(done)} profiles, {written} changed")
+    return [{"id": pid, "output": out, "written": w} for pid, out, w in done]
+
+
+# ─────────────────────────────────────────────
+#  DAEMON
+# ─────────────────────────────────────────────
+
+class BriefDaemon:
+    """
+    Resident mode. Keeps the HTTP session, caches and every source's latest
+    result in memory, refreshes each source on its own SOURCES "refresh"
+    schedule (sports faster while a tracked game is live), re-renders only
+    the sections whose data changed and serves the current page over HTTP.
+    """
+
+    def __init__(self, output: str = OUTPUT_FILE, lazy: bool = False):
+        self.output   = output
+        self.lazy     = lazy
+        self.jobs     = page_jobs()
+        self.results: dict[str, Any]   = {name: default for name, (_, default) in self.jobs.items()}
+        self.next_due: dict[str, float] = {name: 0.0 for name in self.jobs}
+        self.page     = b""
+        self.variants: dict[str, bytes] = {}
+        self.etag     = ""
+        self.fragments: dict[str, tuple[bytes, dict[str, bytes], str]] = {}
+        self.data: dict = {}
+        self.report: dict = {}
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+
+    def interval(self, name: str) -> float:
+        if name == "sports" and any(
+            is_live(g) for team in self.results.get("sports") or [] for g in team["games"]
+        ):
+            return LIVE_REFRESH_INTERVAL
+        return source_refresh(name)
+
+    def refresh(self, names: list[str], use_fresh: bool = False) -> None:
+        """Fetches the named sources, then re-renders and republishes the page."""
+        METRICS.reset()
+        fetched = fetch_with_snapshots({n: self.jobs[n] for n in names},
+                                       deadlines=source_deadlines(names), use_fresh=use_fresh)
+        self.results.update(fetched)
+        report = render_page(assemble_page_data(self.results), self.output, lazy=self.lazy)
+        out_dir = os.path.dirname(self.output)
+        page, variants, etag = self._load_artifact(self.output)
+        fragments = {path: self._load_artifact(os.path.join(out_dir, path))
+                     for path in report["fragments"].values()}
+        data = load_json(os.path.join(out_dir, DATA_FILE), {})
+        with self._lock:
+            self.page, self.variants, self.report, self.data = page, variants, report, data
+            self.etag, self.fragments = etag, fragments
+        METRICS.write(os.path.join(os.path.dirname(self.output), METRICS_FILE))
+        HOST_HEALTH.save()
+
+        done = time.monotonic()
+        for name in names:
+            self.next_due[name] = done + self.interval(name)
+        logger.info(f"[Daemon] refreshed {', '.join(names)}; "
+                    f"changed: {', '.join(report['changed']) or 'nothing'}")
+
+    @staticmethod
+    def _load_artifact(path: str) -> tuple[bytes, dict[str, bytes], str]:
+        """(body, compressed variants by encoding, ETag) of a file written by write_artifacts."""
+        meta = load_json(path + HEADERS_SUFFIX, {})
+        with open(path, "rb") as f:
+            body = f.read()
+        variants = {}
+        for encoding, v in meta.get("variants", {}).items():
+            with open(os.path.join(os.path.dirname(path), v["file"]), "rb") as f:
+                variants[encoding] = f.read()
+        return body, variants, meta.get("headers", {}).get("ETag", "")
+
+    def serve(self, host: str = SERVE_HOST, port: int = SERVE_PORT):
+        """Starts the page server on a background thread and returns it."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        daemon = self
+
+        class PageHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                headers = {"Cache-Control": "no-cache"}
+                with daemon._lock:
+                    artifact = None
+                    if path in ("/", "/index.html"):
+                        artifact = daemon.page, daemon.variants, daemon.etag
+                    elif path[1:] in daemon.fragments:
+                        artifact = daemon.fragments[path[1:]]
+                        headers["Cache-Control"] = FRAGMENT_CACHE_CONTROL
+                    if artifact:
+                        body, variants, etag = artifact
+                        ctype = "text/html; charset=utf-8"
+                        headers["Vary"] = "Accept-Encoding"
+                        if etag:
+                            headers["ETag"] = etag
+                        accepted = self.headers.get("Accept-Encoding", "")
+                        for encoding in ("br", "gzip"):
+                            if encoding in accepted and encoding in variants:
+                                body = variants[encoding]
+                                headers["Content-Encoding"] = encoding
+                                break
+                    elif path == f"/{DATA_FILE}":
+                        known = set(dict(parse_qsl(query)).get("known", "").split(","))
+                        body = json.dumps(section_delta(daemon.data, known) if daemon.data else {},
+                                          separators=(",", ":"), default=str).encode()
+                        ctype = "application/json"
+                    elif path == f"/{CHANGE_REPORT_FILE}":
+                        body, ctype = json.dumps(daemon.report).encode(), "application/json"
+                    elif path == f"/{METRICS_FILE}":
+                        body, ctype = json.dumps(METRICS.to_dict()).encode(), "application/json"
+                    else:
+                        body, ctype = b"", ""
+                if not ctype:
+                    self.send_error(404)
+                    return
+                if headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+                    self.send_response(304)
+                    self.send_header("ETag", headers["ETag"])
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), PageHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="serve", daemon=True).start()
+        logger.info(f"[Daemon] serving http://{host}:{server.server_port}/")
+        return server
+
+    def refresh_or_reschedule(self, names: list[str], use_fresh: bool = False) -> None:
+        """refresh(), but a failure (disk, render, ...) is logged and the sources retried later."""
+        try:
+            self.refresh(names, use_fresh=use_fresh)
+        except Exception as e:
+            logger.error(f"[Daemon] refresh of {', '.join(names)} failed: {e!r}", exc_info=True)
+            retry_at = time.monotonic()
+            for name in names:
+                self.next_due[name] = retry_at + self.interval(name)
+
+    def run_forever(self) -> None:
+        # First pass: fresh snapshots are good enough to put a page up at once.
+        self.refresh_or_reschedule(list(self.jobs), use_fresh=True)
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [name for name, at in self.next_due.items() if at <= now]
+            if due:
+                self.refresh_or_reschedule(due)
+                continue
+            self._stop.wait(min(self.next_due.values()) - now)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+# ─────────────────────────────────────────────
+#  PROFILING  (--profile)
+# ─────────────────────────────────────────────
+
+_parse_log: Optional[list[tuple[Callable[[bytes], Any], bytes]]] = None
+
+
+def note_parse(parse: Callable[[bytes], Any], body: bytes) -> None:
+    """Remembers a (parser, body) pair while profiling so the parse stage can rerun it alone."""
+    if _parse_log is not None:
+        _parse_log.append((parse, body))
+
+
+class StackSampler:
+    """
+    Samples the stacks of every thread each `interval` seconds from a
+    background thread and counts them in collapsed form ("a;b;c N"), the
+    input format of flamegraph.pl, speedscope and friends.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_S):
+        self.interval = interval
+        self.counts: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for t in threading.enumerate():
+                names[t.ident] = t.name
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                                 f":{code.co_firstlineno})")
+                    frame = frame.f_back
+                key = ";".join([names.get(ident, "thread").rstrip("_0123456789")]
+                               + stack[::-1])
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in sorted(self.counts.items()):
+                f.write(f"{stack} {n}\n")
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """The process's peak resident set (VmHWM) in KB, if the platform reports it."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _reset_peak_rss() -> bool:
+    """Resets VmHWM so the next reading is this stage's own peak (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+@contextmanager
+def profile_stage(stage: str, report_dir: str, summary: dict):
+    """
+    Runs the block under cProfile (in every thread it starts), the stack
+    sampler and tracemalloc, then writes <stage>.pstats, <stage>.collapsed
+    and <stage>.alloc.txt to report_dir and adds wall/CPU time, traced-memory
+    peak and peak RSS to summary[stage]. The tools slow the block down, so
+    its timings are for comparing runs with each other, not with metrics.json.
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    profiles: list = []
+    profiles_lock = threading.Lock()
+    # Up to 3.11 cProfile only sees the thread that enabled it, so each new
+    # thread gets its own profiler. From 3.12 it runs on sys.monitoring,
+    # which covers every thread and allows only one active profiler.
+    per_thread = sys.version_info < (3, 12)
+
+    def _thread_bootstrap(*_):
+        # First profile event in a new thread: hand the thread over to cProfile.
+        prof = cProfile.Profile()
+        with profiles_lock:
+            profiles.append(prof)
+        prof.enable()
+
+    rss_reset = _reset_peak_rss()
+    rss_before = _peak_rss_kb()
+    tracemalloc.start(25)
+    main_prof = cProfile.Profile()
+    profiles.append(main_prof)
+    sampler = StackSampler()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        with sampler:   # started before setprofile so the sampler itself isn't profiled
+            if per_thread:
+                threading.setprofile(_thread_bootstrap)
+            main_prof.enable()
+            try:
+                yield
+            finally:
+                main_prof.disable()
+    finally:
+        if per_thread:
+            threading.setprofile(None)
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with profiles_lock:
+            for prof in profiles[1:]:
+                prof.disable()   # worker threads that are still alive
+            stats = pstats.Stats(*profiles)
+        stats.dump_stats(os.path.join(report_dir, f"{stage}.pstats"))
+        sampler.write(os.path.join(report_dir, f"{stage}.collapsed"))
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ])
+        with open(os.path.join(report_dir, f"{stage}.alloc.txt"), "w", encoding="utf-8") as f:
+            f.write(f"{stage}: traced peak {traced_peak / 1024:.1f} KiB\n\n")
+            for stat in snapshot.statistics("lineno")[:PROFILE_TOP]:
+                f.write(f"{stat}\n")
+
+        rss = _peak_rss_kb()
+        summary[stage] = {
+            "wall_s":           round(wall, 4),
+            "cpu_s":            round(cpu, 4),
+            "profilers":        len(profiles),
+            "samples":          sum(sampler.counts.values()),
+            "traced_peak_kb":   round(traced_peak / 1024, 1),
+            # Without a VmHWM reset this is the process-wide peak so far.
+            "peak_rss_kb":      rss,
+            "peak_rss_is_stage": rss_reset,
+            "rss_before_kb":    rss_before,
+        }
+        logger.info(f"[Profile] {stage}: {wall:.3f}s wall, {cpu:.3f}s CPU, "
+                    f"traced peak {traced_peak / 1024:.0f} KiB, peak RSS {rss} KiB")
+
+
+def run_profile(report_root: str = PROFILE_DIR) -> str:
+    """
+    One full build with the fetch, parse and render stages profiled
+    separately. Fetch runs against a cold scratch cache so every source
+    is really fetched and parsed (use --replay for deterministic input);
+    parse then reruns every parser over the bodies fetch received, single
+    threaded; render builds the page from scratch into the report
+    directory. Returns the report directory.
+    """
+    import tempfile
+    global _parse_log
+    report_dir = os.path.join(report_root, datetime.now().strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(report_dir, exist_ok=True)
+    summary: dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory(prefix="brief-profile-") as scratch:
+        previous_cache = CACHE_DIR
+        set_cache_dir(scratch)
+        reset_caches()
+        METRICS.reset()
+        _parse_log = []
+        try:
+            with profile_stage("fetch", report_dir, summary):
+                data = fetch_all()
+            parses, _parse_log = _parse_log, None
+            with profile_stage("parse", report_dir, summary):
+                for parse, body in parses:
+                    parse(body)
+            summary["parse"]["parsers_run"] = len(parses)
+            with profile_stage("render", report_dir, summary):
+                render_page(data, os.path.join(report_dir, OUTPUT_FILE))
+        finally:
+            _parse_log = None
+            HISTORY.close()
+            set_cache_dir(previous_cache)
+            reset_caches()
+
+    METRICS.write(os.path.join(report_dir, METRICS_FILE))
+    save_json(os.path.join(report_dir, "summary.json"), summary)
+    logger.info(f"[Profile] reports written to {report_dir}")
+    return report_dir
+
+
 # ─────────────────────────────────────────────
 #  ENTRY POINT
 # ─────────────────────────────────────────────
 
-if __name__ == "__main__":
+def check_import_budget(budget_ms: float = IMPORT_BUDGET_MS) -> bool:
+    """
+    Imports this module in a fresh interpreter with -X importtime and checks
+    its cumulative import time against the budget, and that none of the heavy
+    dependencies were pulled in by the import. The bytecode is compiled
+    first and the best of IMPORT_BUDGET_RUNS imports counts, so a fresh
+    checkout (no .pyc) or one slow run on a shared CI machine doesn't fail
+    the check; what it measures is the import every real run pays.
+    """
+    import py_compile
+    import subprocess
+    path = os.path.abspath(__file__)
+    py_compile.compile(path, doraise=True)
+    heavy = ("requests", "feedparser", "zoneinfo")
+    probe = (f"import sys; import news_page; "
+             f"print([m for m in {heavy!r} if m in sys.modules])")
+    timings, leaked = [], ""
+    for _ in range(IMPORT_BUDGET_RUNS):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", probe],
+            cwd=os.path.dirname(path),
+            env={k: v for k, v in os.environ.items() if k not in ("NYT_KEY", "FINNHUB_KEY")},
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            logger.error(f"[Import] import failed:\n{proc.stderr.strip()}")
+            return False
+        timings.append(next(
+            int(line.split("|")[1]) for line in proc.stderr.splitlines()
+            if line.split("|")[-1].strip() == "news_page"
+        ))
+        leaked = proc.stdout.strip()
+    took_ms = min(timings) / 1000
+    ok = took_ms <= budget_ms and leaked == "[]"
+    log = logger.info if ok else logger.error
+    log(f"[Import] news_page imported in {took_ms:.1f} ms "
+        f"(budget {budget_ms:.0f} ms), heavy modules loaded: {leaked}")
+    return ok
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the Daily Brief page.")
+    parser.add_argument("--check-import", action="store_true",
+                        help="verify the module imports within IMPORT_BUDGET_MS and exit")
+    parser.add_argument("--cache-dir", help=f"cache directory (default {CACHE_DIR})")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", nargs="?", const=FIXTURE_DIR, metavar="DIR",
+                      help=f"save every upstream response as a fixture (default {FIXTURE_DIR})")
+    mode.add_argument("--replay", nargs="?", const=FIXTURE_DIR, metavar="DIR",
+                      help="serve upstream responses from recorded fixtures, offline")
+    parser.add_argument("--replay-latency", type=float, default=0.0, metavar="SECONDS",
+                        help="delay added to every replayed response")
+    parser.add_argument("--output", metavar="PATH",
+                        help=f"page to write (default {OUTPUT_FILE}; with --replay, "
+                             f"{OUTPUT_FILE} in the replay's scratch directory)")
+    parser.add_argument("--serve", nargs="?", const=SERVE_PORT, type=int, metavar="PORT",
+                        help=f"stay resident, refresh sources on their own schedules and "
+                             f"serve the page (default port {SERVE_PORT})")
+    parser.add_argument("--host", default=SERVE_HOST, help="address for --serve")
+    parser.add_argument("--lazy", action="store_true",
+                        help=f"write a small shell page ({', '.join(SHELL_SECTIONS)} inlined) and "
+                             f"every other section as a content-hashed file under {FRAGMENT_DIR}/, "
+                             f"loaded as it scrolls into view (also applies to --serve)")
+    parser.add_argument("--batch", metavar="PROFILES",
+                        help="render every profile in a profiles JSON file from one shared fetch")
+    parser.add_argument("--batch-dir", default=BATCH_OUTPUT_DIR, metavar="DIR",
+                        help=f"output directory for --batch (default {BATCH_OUTPUT_DIR})")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="render processes for --batch (default: one per CPU)")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_DIR, metavar="DIR",
+                        help=f"profile the fetch, parse and render stages (cProfile, collapsed "
+                             f"stacks, tracemalloc, peak RSS) into DIR/<timestamp> "
+                             f"(default {PROFILE_DIR}); combine with --replay for repeatable runs")
+    parser.add_argument("--metrics-summary", action="store_true",
+                        help=f"print a table of the stage timings written to {METRICS_FILE}")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    if args.check_import:
+        return 0 if check_import_budget() else 1
+    if args.cache_dir:
+        set_cache_dir(args.cache_dir)
+
+    output = args.output or OUTPUT_FILE
+    if args.replay:
+        # Keep fixture data and fixture-server timings away from the live
+        # cache and page: replay in a scratch directory unless told otherwise.
+        if not args.cache_dir:
+            import tempfile
+            set_cache_dir(tempfile.mkdtemp(prefix="brief-replay-"))
+            logger.info(f"[Replay] cache in {CACHE_DIR}")
+        output = args.output or os.path.join(CACHE_DIR, OUTPUT_FILE)
+        enable_replay(args.replay, latency=args.replay_latency)
+    else:
+        CONFIG.check()
+        if args.record:
+            enable_recording(args.record)
+
+    if args.profile:
+        run_profile(args.profile)
+        if args.metrics_summary:
+            print(METRICS.summary())
+        return 0
+
+    if args.batch:
+        run_batch(load_profiles(args.batch), args.batch_dir, args.workers)
+        HOST_HEALTH.save()
+        METRICS.write(os.path.join(args.batch_dir, METRICS_FILE))
+        if args.metrics_summary:
+            print(METRICS.summary())
+        return 0
+
+    if args.serve is not None:
+        daemon = BriefDaemon(output, lazy=args.lazy)
+        server = daemon.serve(args.host, args.serve)
+        try:
+            daemon.run_forever()
+        except KeyboardInterrupt:
+            logger.info("[Daemon] stopping")
+        finally:
+            server.shutdown()
+        return 0
+
     logger.info("Fetching data...")
-    weather_data    = fetch_weather()
-    nyt_data        = fetch_nyt_data()
-    buffalo_data    = fetch_buffalo_news()
-    bbc_data        = fetch_bbc_middle_east()
-    cnbc_data       = fetch_cnbc_business()
-    sports_data     = fetch_all_sports_data()
-    sports_articles = fetch_nyt_sports()
-    stock_data      = fetch_stock_data()
+    data = fetch_all()
+
+    log_http_pool_stats()
+    HOST_HEALTH.save()
 
     logger.info("Rendering HTML...")
-    html = build_layout(
-        news_html       = render_nyt(nyt_data),
-        local_html      = render_buffalo(buffalo_data),
-        bbc_html        = render_bbc(bbc_data),
-        weather_html    = render_weather(weather_data),
-        scoreboard_html = render_scoreboard(sports_data),
-        sports_html     = render_nyt_sports(sports_articles),
-        cnbc_html       = render_cnbc(cnbc_data),
-        stocks_html     = render_stocks_sidebar(stock_data),
-    )
+    report = render_page(data, output, lazy=args.lazy)
+
+    METRICS.write(os.path.join(os.path.dirname(output), METRICS_FILE))
+    if args.metrics_summary:
+        print(METRICS.summary())
+
+    if report["written"]:
+        logger.info(f"Done! Output written to {output} "
+                    f"(changed: {', '.join(report['changed'])})")
+    else:
+        logger.info(f"Done! No section changed, {output} left as is")
+    return 0
+
 
-    with open("index.html", "w", encoding="utf-8") as f:
-        f.write(html)
+def exit_code(code: int) -> int:
+    """
+    Ends a command-line run. A source dropped at its own deadline may still
+    finish (and save its snapshot) until the run deadline of its fetch stage.
+    concurrent.futures joins every worker thread at interpreter exit, so past
+    that point stragglers would hold the process open through their request
+    timeouts and retries; flush and leave without that join instead.
+    """
+    with _stragglers_lock:
+        waiting = list(_stragglers.items())
+    for f, until in waiting:
+        wait([f], timeout=max(until - time.monotonic(), 0))
+    if stragglers_running():
+        logger.info(f"[Fetch] exiting without waiting for {stragglers_running()} dropped fetches")
+        logging.shutdown()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+    return code
 
-    logger.info("Done! Output written to index.html")
+
+if __name__ == "__main__":
+    sys.exit(exit_code(main()))